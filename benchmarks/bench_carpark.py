@@ -0,0 +1,208 @@
+"""
+Benchmarks for the carpark core and display paths.
+
+    python benchmarks/bench_carpark.py                      # run and print
+    python benchmarks/bench_carpark.py --save base.json     # keep a baseline
+    python benchmarks/bench_carpark.py --compare base.json  # flag regressions
+
+Each benchmark reports the best of several repeats, in seconds per operation.
+Fixtures are generated from a fixed seed so runs are comparable.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "the_project"))
+
+from carpark_manager import CarparkManagement
+from carpark_journal import EventJournal
+from carpark_logfile import BackgroundLogWriter
+import carpark_display
+
+SEED = 1234
+T0 = datetime(2025, 11, 26, 6, 0)
+
+
+def make_plates(n, seed=SEED):
+    rng = random.Random(seed)
+    letters = "ABCDEFGHJKLMNPRSTUVWXYZ"
+    return [f"{''.join(rng.choices(letters, k=3))}{i:06d}" for i in range(n)]
+
+
+def filled_carpark(n, **kwargs):
+    carpark = CarparkManagement(capacity=n, keep_log=False, **kwargs)
+    carpark.handle_entries((p, None, T0 + timedelta(seconds=i)) for i, p in enumerate(make_plates(n)))
+    return carpark
+
+
+def best_of(func, repeat=5, number=1):
+    """Best wall time per call of func() over `repeat` rounds of `number` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+# ---------------- BENCHMARKS ---------------- #
+# each returns seconds per operation
+
+def bench_entry_exit(n):
+    plates = make_plates(n)
+    entry_times = [T0 + timedelta(seconds=i) for i in range(n)]
+    exit_times = [T0 + timedelta(seconds=n + i) for i in range(n)]
+
+    def run():
+        carpark = CarparkManagement(capacity=n, keep_log=False)
+        for plate, when in zip(plates, entry_times):
+            carpark.handle_entry(plate, None, when)
+        for plate, when in zip(plates, exit_times):
+            carpark.handle_exit(plate, when)
+    return best_of(run, repeat=3) / (2 * n)
+
+
+def bench_entry_exit_batch(n):
+    entries = [(p, None, T0 + timedelta(seconds=i)) for i, p in enumerate(make_plates(n))]
+    exits = [(p, when + timedelta(seconds=n)) for p, _, when in entries]
+
+    def run():
+        carpark = CarparkManagement(capacity=n, keep_log=False)
+        carpark.handle_entries(entries)
+        carpark.handle_exits(exits)
+    return best_of(run, repeat=3) / (2 * n)
+
+
+def bench_available_spaces(n):
+    carpark = filled_carpark(n)
+    return best_of(carpark.available_spaces, number=10000)
+
+
+def bench_get_active_cars(n):
+    carpark = filled_carpark(n)
+    return best_of(carpark.get_active_cars, number=10)
+
+
+def bench_save_log(n):
+    carpark = CarparkManagement(capacity=n)
+    carpark.handle_entries((p, None, T0) for p in make_plates(n))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "log.json")
+        return best_of(lambda: carpark.save_log(path), repeat=3)
+
+
+def bench_journal_append(n):
+    plates = make_plates(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        def run():
+            with EventJournal(os.path.join(tmp, "events.ndjson"), fsync="never") as journal:
+                carpark = CarparkManagement(capacity=n, journal=journal, keep_log=False)
+                for plate in plates:
+                    carpark.handle_entry(plate, None, T0)
+        return best_of(run, repeat=3) / n
+
+
+def bench_log_file_writes(n):
+    with tempfile.TemporaryDirectory() as tmp:
+        def run():
+            with BackgroundLogWriter(os.path.join(tmp, "carpark_log.txt")) as writer:
+                for i in range(n):
+                    writer.write(f"[IN]  PLATE{i}")
+        return best_of(run, repeat=3) / n
+
+
+def bench_render_summary(n):
+    carpark = filled_carpark(n)
+    weather = os.path.join(os.path.dirname(carpark_display.__file__), "weather.json")
+    sink = io.StringIO()
+
+    def run():
+        with contextlib.redirect_stdout(sink):
+            carpark_display.render_summary(carpark, weather)
+        sink.seek(0)
+        sink.truncate()
+    return best_of(run, number=1000)
+
+
+def bench_config_load(_n):
+    config = os.path.join(os.path.dirname(carpark_display.__file__), "moondalup.json")
+    return best_of(lambda: CarparkManagement.from_config_file(config), number=200)
+
+
+BENCHMARKS = {
+    "entry_exit": bench_entry_exit,
+    "entry_exit_batch": bench_entry_exit_batch,
+    "available_spaces": bench_available_spaces,
+    "get_active_cars": bench_get_active_cars,
+    "save_log": bench_save_log,
+    "journal_append": bench_journal_append,
+    "log_file_writes": bench_log_file_writes,
+    "render_summary": bench_render_summary,
+    "config_load": bench_config_load,
+}
+# benchmarks whose cost does not depend on the fixture size only run once
+SIZE_INDEPENDENT = {"config_load"}
+
+
+def run_all(sizes, only=None):
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        for n in ([sizes[0]] if name in SIZE_INDEPENDENT else sizes):
+            key = f"{name}[{n}]"
+            results[key] = bench(n)
+            print(f"{key:32} {results[key] * 1e6:12.3f} us/op", flush=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print the change against a saved baseline; return the keys that got slower than threshold."""
+    slower = []
+    print(f"\n{'benchmark':32} {'baseline':>12} {'now':>12} {'change':>8}")
+    for key, now in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        change = now / before - 1
+        flag = "  <-- slower" if change > threshold else ""
+        if flag:
+            slower.append(key)
+        print(f"{key:32} {before * 1e6:12.3f} {now * 1e6:12.3f} {change:+8.1%}{flag}")
+    return slower
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Carpark benchmarks")
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="Comma separated fixture sizes (cars), e.g. 1000,1000000")
+    parser.add_argument("--only", help="Comma separated benchmark names to run")
+    parser.add_argument("--save", metavar="PATH", help="Save results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Relative slowdown reported as a regression (default 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    only = set(args.only.split(",")) if args.only else None
+    results = run_all(sizes, only)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"created": datetime.now().isoformat(), "python": sys.version.split()[0],
+                       "results": results}, f, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
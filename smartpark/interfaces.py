@@ -51,3 +51,27 @@ class CarparkDataProvider(abc.ABC):
     def current_time(self):
         pass
 
+    # Optional trend data. Providers that keep rolling statistics override
+    # these; the defaults mean "not available".
+    @property
+    def occupancy_rate_15m(self):
+        '''Share of bays in use over the last 15 minutes (0..1)'''
+        return None
+    @property
+    def occupancy_rate_1h(self):
+        '''Share of bays in use over the last hour (0..1)'''
+        return None
+    @property
+    def arrivals_per_minute(self):
+        return None
+    @property
+    def departures_per_minute(self):
+        return None
+    @property
+    def mean_dwell_inside(self):
+        '''Average seconds the cars currently inside have been parked'''
+        return None
+    @property
+    def fill_eta(self):
+        '''Seconds until the carpark is full at the current rate'''
+        return None
@@ -26,8 +26,8 @@ import os
 '''
 class MockCarparkManager(CarparkSensorListener,CarparkDataProvider):
     #constant, for where to get the configuration data
-    CONFIG_FILE = os.path.join(os.path.dirname(__file__),\
-        "\..\\samples_and_snippets\\carpark_config.txt")
+    CONFIG_FILE = os.path.join(os.path.dirname(__file__),
+        "..", "samples_and_snippets", "carpark_config.txt")
 
     def __init__(self):
   #      configuration = parse_config(MockCarparkManager.CONFIG_FILE)
@@ -5,7 +5,6 @@ You need to split the classes here into two files, one for the CarParkDisplay an
 Attend to the TODOs in each class to complete the implementation."""
 from interfaces import CarparkSensorListener
 from interfaces import CarparkDataProvider
-import threading
 import time
 import tkinter as tk
 from typing import Iterable
@@ -78,13 +77,13 @@ class CarParkDisplay:
     fields = ['Available bays', 'Temperature', 'At']
 
     def __init__(self,root):
+        self.root=root
         self.window = WindowedDisplay(root,
             'Moondalup', CarParkDisplay.fields)
-        updater = threading.Thread(target=self.check_updates)
-        updater.daemon = True
-        updater.start()
         self.window.show()
         self._provider=None
+        self._update_pending=False
+        self.tick()
     
     @property
     def data_provider(self):
@@ -93,6 +92,7 @@ class CarParkDisplay:
     def data_provider(self,provider):
         if isinstance(provider,CarparkDataProvider):
             self._provider=provider
+            self.request_update()
 
     def update_display(self):
         field_values = dict(zip(CarParkDisplay.fields, [
@@ -102,14 +102,35 @@ class CarParkDisplay:
         ]))
         self.window.update(field_values)
 
-    def check_updates(self):
-        while True:
-            # TODO: This timer is pretty janky! Can you provide some kind of signal from your code
-            # to update the display?
-            time.sleep(1)
-            # When you get an update, refresh the display.
-            if self._provider is not None:
-                self.update_display()
+    def request_update(self):
+        # Called when something happens. Several requests before the Tk loop
+        # gets round to it are coalesced into a single redraw.
+        if self._update_pending:
+            return
+        self._update_pending=True
+        self.root.after_idle(self._do_update)
+
+    def _do_update(self):
+        self._update_pending=False
+        if self._provider is not None:
+            self.update_display()
+
+    def tick(self):
+        # the clock is the only field that changes without an event
+        self.request_update()
+        self.root.after(1000,self.tick)
+
+
+class DisplayUpdateListener(CarparkSensorListener):
+    """Listens to the detector and asks the display to redraw straight away."""
+    def __init__(self,display):
+        self.display=display
+    def incoming_car(self,license_plate):
+        self.display.request_update()
+    def outgoing_car(self,license_plate):
+        self.display.request_update()
+    def temperature_reading(self,reading):
+        self.display.request_update()
 
 
 class CarDetectorWindow:
@@ -183,5 +204,7 @@ if __name__ == '__main__':
     detector=CarDetectorWindow(root)
     #TODO: Attach your event listener
     detector.add_listener(mock)
+    # redraw the display whenever the detector fires
+    detector.add_listener(DisplayUpdateListener(display))
 
     root.mainloop()
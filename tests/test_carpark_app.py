@@ -0,0 +1,119 @@
+import unittest
+import sys,os
+import contextlib
+import io
+import subprocess
+from pathlib import Path
+cwd = Path(os.path.dirname(__file__))
+parent = str(cwd.parent)
+
+sys.path.append(parent + "/the_project")
+
+import carpark_app
+from carpark_manager import CarparkManagement
+
+
+class TestHeadlessApp(unittest.TestCase):
+
+    def test_headless_imports_do_not_load_tkinter(self):
+        code = "import sys, carpark_app; print('tkinter' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], cwd=parent + "/the_project",
+                                capture_output=True, text=True, check=True)
+        self.assertEqual("False", result.stdout.strip())
+
+    def test_gui_rejects_headless_flags(self):
+        with self.assertRaises(SystemExit) as exit_, contextlib.redirect_stderr(io.StringIO()) as err:
+            carpark_app.main(["--gui", "--port", "1884"])
+        self.assertEqual(2, exit_.exception.code)
+        self.assertIn("--port cannot be used with --gui", err.getvalue())
+
+    def test_snapshot_needs_journal(self):
+        with self.assertRaises(SystemExit) as exit_, contextlib.redirect_stderr(io.StringIO()) as err:
+            carpark_app.main(["--snapshot", "snapshot.json"])
+        self.assertEqual(2, exit_.exception.code)
+        self.assertIn("need --journal", err.getvalue())
+
+    def test_gui_finds_config_next_to_module(self):
+        gui = carpark_app.load_gui_module()
+        old_cwd = os.getcwd()
+        os.chdir(parent)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                manager = gui.load_carpark_manager(max_stay=60)
+        finally:
+            os.chdir(old_cwd)
+        self.assertEqual(60, manager.overstays.max_stay)
+
+
+class FakeRoot:
+    """Just enough of tk.Tk for the notifier: records after() delays."""
+    def __init__(self):
+        self.delays = []
+        self.callback = None
+
+    def after(self, delay, callback):
+        self.delays.append(delay)
+        self.callback = callback
+        return len(self.delays)
+
+    def after_cancel(self, after_id):
+        self.delays.append("cancel")
+
+
+class TestTkNotifier(unittest.TestCase):
+
+    def test_backs_off_while_idle(self):
+        root = FakeRoot()
+        notifier = carpark_app.load_gui_module().TkNotifier(root, frame_ms=16, idle_ms=100)
+        seen = []
+        notifier.add_handler(seen.append)
+        for _ in range(4):
+            root.callback()
+        self.assertEqual([16, 32, 64, 100, 100], root.delays)
+        # posted on the Tk thread: flushed in the next frame, not after the idle delay
+        notifier.post({"event": "entry"})
+        self.assertEqual(["cancel", 16], root.delays[-2:])
+        root.callback()
+        self.assertEqual([[{"event": "entry"}]], seen)
+        self.assertEqual(16, root.delays[-1])
+
+
+class FakeWidget:
+    """Stands in for the Listbox, the count Label and the filter StringVar."""
+    def __init__(self):
+        self.rows = []
+
+    def insert(self, index, *rows):
+        self.rows[index:index] = rows
+
+    def delete(self, index):
+        del self.rows[index]
+
+    def config(self, **kwargs):
+        pass
+
+    def get(self):
+        return ""
+
+
+class TestParkedCarsWindow(unittest.TestCase):
+
+    def test_event_already_applied_by_rebuild_is_skipped(self):
+        gui = carpark_app.load_gui_module()
+        carpark = CarparkManagement(capacity=5)
+        window = gui.ParkedCarsWindow.__new__(gui.ParkedCarsWindow)
+        window.manager, window.virtual = carpark, False
+        window.listbox = window.count_label = window.filter_var = FakeWidget()
+        carpark.handle_entry("ABC123")
+        # a filter keystroke rebuilds before the notifier delivers the entry
+        window._plates = carpark.plates_with_prefix("")
+        window.listbox.insert(0, *window._plates)
+        window.refresh([{"event": "entry", "plate": "ABC123"}, {"event": "entry", "plate": "XYZ789"}])
+        self.assertEqual(["ABC123", "XYZ789"], window._plates)
+        self.assertEqual(["ABC123", "XYZ789"], window.listbox.rows)
+        window.refresh([{"event": "exit", "plate": "ABC123"}, {"event": "exit", "plate": "ABC123"}])
+        self.assertEqual(["XYZ789"], window.listbox.rows)
+
+
+if __name__=="__main__":
+    unittest.main()
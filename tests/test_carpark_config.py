@@ -0,0 +1,80 @@
+import unittest
+import sys,os
+import tempfile
+from pathlib import Path
+cwd = Path(os.path.dirname(__file__))
+parent = str(cwd.parent)
+
+sys.path.append(parent + "/the_project")
+
+from carpark_manager import CarparkManagement
+from carpark_config import ConfigWatcher, load_configs
+
+
+class TestCarparkConfig(unittest.TestCase):
+
+    def test_formats(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            multi = Path(tmp, "parks.json")
+            multi.write_text('{"CarParks": [{"name": "raf-park", "total-spaces": 130, "port": 1883},'
+                             ' {"name": "second", "total-spaces": 12}]}')
+            configs = load_configs(str(multi))
+            self.assertEqual([("raf-park", 130), ("second", 12)], [(c.name, c.capacity) for c in configs])
+            self.assertEqual(1883, configs[0].port)
+
+            toml = Path(tmp, "park.toml")
+            toml.write_text('[[CarParks]]\nname = "toml-park"\ncapacity = 40\n')
+            self.assertEqual("toml-park", load_configs(str(toml))[0].name)
+
+            ryo = Path(tmp, "carpark_config.txt")
+            ryo.write_text('location = "Moondalup City Square Parking"\nnumber_of_spaces = 192  # bays\n')
+            self.assertEqual(("Moondalup City Square Parking", 192),
+                             (load_configs(str(ryo))[0].name, load_configs(str(ryo))[0].capacity))
+
+            bad = Path(tmp, "bad.json")
+            bad.write_text('{"carpark_name": "x", "capacity": -1}')
+            with self.assertRaises(ValueError):
+                load_configs(str(bad))
+
+    def test_watcher_keeps_parked_cars(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "moondalup.json")
+            path.write_text('{"carpark_name": "Moondalup", "capacity": 2}')
+            carpark = CarparkManagement.from_config_file(str(path))
+            carpark.handle_entry("ABC123")
+            watcher = ConfigWatcher(str(path), carpark)
+            path.write_text('{"carpark_name": "Moondalup Central", "capacity": 10}')
+            self.assertTrue(watcher.check())
+            self.assertEqual(("Moondalup Central", 9), (carpark.name, carpark.available_spaces()))
+            path.write_text('{"carpark_name": "Moondalup Central"}')
+            with self.assertLogs("carpark_config", level="WARNING"):
+                self.assertFalse(watcher.check())
+            self.assertIsNotNone(watcher.last_error)
+            self.assertEqual(10, carpark.total_spaces())
+
+    def test_watcher_follows_rename_by_name(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "parks.json")
+            path.write_text('{"CarParks": [{"name": "first", "capacity": 5}, {"name": "second", "capacity": 8}]}')
+            carpark = CarparkManagement(capacity=8, name="second")
+            watcher = ConfigWatcher(str(path), carpark, name="second")
+            path.write_text('{"CarParks": [{"name": "first", "capacity": 5}, {"name": "Second Street", "capacity": 9}]}')
+            self.assertTrue(watcher.check())
+            self.assertEqual(("Second Street", 9), (carpark.name, carpark.total_spaces()))
+            self.assertEqual("Second Street", watcher.name)
+            path.write_text('{"CarParks": [{"name": "first", "capacity": 5}]}')
+            with self.assertLogs("carpark_config", level="WARNING"):
+                self.assertFalse(watcher.check())
+            self.assertIn("Second Street", str(watcher.last_error))
+            self.assertEqual(9, carpark.total_spaces())
+
+    def test_rejects_repeated_names(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "parks.json")
+            path.write_text('{"CarParks": [{"name": "same", "capacity": 5}, {"name": "same", "capacity": 8}]}')
+            with self.assertRaisesRegex(ValueError, "more than one carpark named 'same'"):
+                load_configs(str(path))
+
+
+if __name__=="__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+import sys,os
+import tempfile
+from pathlib import Path
+cwd = Path(os.path.dirname(__file__))
+parent = str(cwd.parent)
+
+sys.path.append(parent + "/the_project")
+
+from carpark_display import TemperatureSource
+
+
+class TestTemperatureSource(unittest.TestCase):
+
+    def test_rereads_only_when_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "weather.json")
+            Path(path).write_text('{"temperature_c": 22.4}')
+            source = TemperatureSource(path, poll_interval=0)
+            self.assertEqual(22.4, source.read())
+            Path(path).write_text('{"temperature_c": 31.25}')
+            self.assertEqual(31.25, source.read())
+            os.remove(path)
+            self.assertIsNone(source.read())
+
+    def test_poll_interval_skips_stat(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "weather.json")
+            Path(path).write_text('{"temperature_c": 22.4}')
+            source = TemperatureSource(path, poll_interval=3600)
+            self.assertEqual(22.4, source.read())
+            os.remove(path)
+            self.assertEqual(22.4, source.read())
+
+
+if __name__=="__main__":
+    unittest.main()
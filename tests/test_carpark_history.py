@@ -0,0 +1,75 @@
+import unittest
+import sys,os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+cwd = Path(os.path.dirname(__file__))
+parent = str(cwd.parent)
+
+sys.path.append(parent + "/the_project")
+
+from carpark_manager import CarparkManagement
+from carpark_history import VisitHistory
+
+T0 = datetime(2025, 11, 26, 8, 0)
+
+
+class TestVisitHistory(unittest.TestCase):
+
+    def test_dwell_and_peak(self):
+        carpark = CarparkManagement(capacity=5, keep_history=True)
+        carpark.handle_entries([("A", "Mazda 3", T0), ("B", None, T0.replace(minute=10)),
+                                ("C", "Mazda 3", T0.replace(minute=20))])
+        carpark.handle_exits([("A", T0.replace(hour=9)), ("B", T0.replace(hour=9)),
+                              ("C", T0.replace(hour=10, minute=20))])
+        stats = carpark.history.dwell_stats()
+        self.assertEqual(3, stats["count"])
+        self.assertEqual(3000, stats["min"])
+        self.assertEqual(7200, stats["max"])
+        self.assertEqual(3600, stats["p50"])
+        self.assertEqual(2, carpark.history.dwell_stats(model="Mazda 3")["count"])
+        self.assertEqual((3, T0.replace(minute=20).timestamp()), carpark.history.peak_occupancy())
+        self.assertEqual(3, sum(carpark.history.hourly_turnover()))
+        stats = carpark.visit_stats(model="Mazda 3")
+        self.assertEqual(2, stats["dwell"]["count"])
+        self.assertEqual(carpark.history.peak_occupancy(), stats["peak_occupancy"])
+
+    def test_copy_is_independent(self):
+        history = VisitHistory()
+        history.add(T0, T0.replace(hour=9), "Mazda 3")
+        snapshot = history.copy()
+        history.add(T0, T0.replace(hour=10), "Tesla Model 3")
+        self.assertEqual((1, 2), (len(snapshot), len(history)))
+        self.assertEqual({"count": 0}, snapshot.dwell_stats(model="Tesla Model 3"))
+
+    @unittest.skipUnless(hasattr(time, "tzset"), "needs time.tzset")
+    def test_hourly_turnover_across_dst_change(self):
+        old_tz = os.environ.get("TZ")
+        os.environ["TZ"] = "Europe/London"
+        time.tzset()
+        try:
+            history = VisitHistory()
+            # noon UTC is 12:00 GMT before the 30 March 2025 change and 13:00 BST after it
+            for day in (29, 31):
+                noon = datetime(2025, 3, day, 12, 0, tzinfo=timezone.utc)
+                history.add(noon.replace(hour=9), noon)
+            counts = history.hourly_turnover()
+            self.assertEqual((1, 1), (counts[12], counts[13]))
+        finally:
+            if old_tz is None:
+                del os.environ["TZ"]
+            else:
+                os.environ["TZ"] = old_tz
+            time.tzset()
+
+    def test_disabled_by_default(self):
+        carpark = CarparkManagement(capacity=5)
+        carpark.handle_entry("A", when=T0)
+        carpark.handle_exit("A", when=T0.replace(hour=9))
+        self.assertIsNone(carpark.history)
+        with self.assertRaises(ValueError):
+            carpark.visit_stats()
+
+
+if __name__=="__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import sys,os
+import asyncio
+from pathlib import Path
+cwd = Path(os.path.dirname(__file__))
+parent = str(cwd.parent)
+
+sys.path.append(parent + "/the_project")
+
+from carpark_manager import CarparkManagement
+from carpark_ingest import IngestServer
+
+
+class FlakyManager(CarparkManagement):
+    """Fails every batch that contains the plate BAD, like a journal write error would."""
+
+    def handle_entries(self, entries):
+        entries = list(entries)
+        if any(plate == "BAD" for plate, _, _ in entries):
+            raise OSError("journal write failed")
+        return super().handle_entries(entries)
+
+
+async def wait_for_received(server, count, timeout=5.0):
+    async def received():
+        while sum(s.received for s in server.sources) < count:
+            await asyncio.sleep(0.01)
+    try:
+        await asyncio.wait_for(received(), timeout)
+    except asyncio.TimeoutError:
+        got = sum(s.received for s in server.sources)
+        raise AssertionError(f"expected {count} events within {timeout}s, got {got}") from None
+
+
+class TestIngestServer(unittest.TestCase):
+
+    def test_many_gates_with_small_queue(self):
+        carpark = CarparkManagement(capacity=1000, keep_log=False)
+
+        async def scenario():
+            server = IngestServer(carpark, "127.0.0.1", 0, queue_size=8, max_batch=4)
+            await server.start()
+
+            async def gate(n):
+                reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+                for i in range(100):
+                    writer.write(f"enter G{n}-{i} Mazda 3\n".encode())
+                    if i % 2:
+                        writer.write(f"exit G{n}-{i}\n".encode())
+                await writer.drain()
+                writer.close()
+                await writer.wait_closed()
+
+            await asyncio.gather(*(gate(n) for n in range(10)))
+            await wait_for_received(server, 1500)
+            await server.stop()
+            return server
+
+        server = asyncio.run(scenario())
+        self.assertEqual(1500, server.consumer.processed)
+        self.assertEqual(500, len(carpark.get_active_cars()))
+        self.assertEqual("Mazda 3", carpark.get_active_cars()[0].model)
+
+    def test_failed_batch_does_not_stop_consumer(self):
+        carpark = FlakyManager(capacity=100, keep_log=False)
+
+        async def scenario():
+            server = IngestServer(carpark, "127.0.0.1", 0, queue_size=2, max_batch=1)
+            await server.start()
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(b"enter BAD\n" + b"".join(f"enter P{i}\n".encode() for i in range(20)))
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+            await wait_for_received(server, 21)
+            await server.stop()
+            return server
+
+        with self.assertLogs("carpark_ingest", level="ERROR"):
+            server = asyncio.run(scenario())
+        self.assertEqual(1, server.consumer.failed)
+        self.assertEqual(20, carpark.occupied())
+
+    def test_stop_closes_connected_gates(self):
+        carpark = CarparkManagement(capacity=10, keep_log=False)
+
+        async def scenario():
+            server = IngestServer(carpark, "127.0.0.1", 0)
+            await server.start()
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(b"enter ABC123\n")
+            await writer.drain()
+            await wait_for_received(server, 1)
+            # the gate stays connected
+            await asyncio.wait_for(server.stop(), 5.0)
+            self.assertEqual(b"", await asyncio.wait_for(reader.read(), 5.0))
+            writer.close()
+
+        asyncio.run(scenario())
+        self.assertEqual(1, carpark.occupied())
+
+
+if __name__=="__main__":
+    unittest.main()
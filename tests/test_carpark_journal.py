@@ -0,0 +1,127 @@
+import unittest
+import sys,os
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+cwd = Path(os.path.dirname(__file__))
+parent = str(cwd.parent)
+
+sys.path.append(parent + "/the_project")
+
+from carpark_manager import CarparkManagement
+from carpark_journal import EventJournal, read_journal
+
+
+class TestEventJournal(unittest.TestCase):
+
+    def test_journal_without_memory_log(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.ndjson")
+            journal = EventJournal(path, fsync="never")
+            carpark = CarparkManagement(capacity=5, journal=journal, keep_log=False)
+            carpark.handle_entry("ABC123", "Mazda 3")
+            carpark.handle_exit("ABC123")
+            carpark.save_log()
+            self.assertEqual([], carpark.get_log())
+            events = list(read_journal(path))
+            self.assertEqual(["entry", "exit"], [e["event"] for e in events])
+            self.assertEqual("Mazda 3", events[0]["model"])
+            journal.close()
+
+    def test_interval_policy_syncs_when_idle(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.ndjson")
+            with EventJournal(path, fsync="interval", fsync_interval=0.05) as journal:
+                journal.append({"event": "entry", "plate": "ABC123"})
+                deadline = time.monotonic() + 5.0
+                while os.path.getsize(path) == 0 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                self.assertEqual(["entry"], [e["event"] for e in read_journal(path)])
+
+    def test_restore_from_snapshot_and_journal_tail(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.ndjson")
+            snapshot = os.path.join(tmp, "snapshot.json")
+            journal = EventJournal(path, fsync="never")
+            carpark = CarparkManagement(capacity=5, name="Moondalup", journal=journal,
+                                        snapshot_path=snapshot, snapshot_every=2)
+            carpark.handle_entry("ABC123", "Mazda 3")
+            carpark.handle_entry("XYZ789")
+            carpark.handle_exit("ABC123")
+            carpark.handle_entry("NEW001")
+            journal.close()
+            with open(path, "a") as f:
+                f.write('{"event":"entry","plate":"TORN')
+
+            restored = CarparkManagement.restore(snapshot, EventJournal(path, fsync="never"))
+            self.assertEqual("Moondalup", restored.name)
+            self.assertEqual(["XYZ789", "NEW001"], [c.license_plate for c in restored.get_active_cars()])
+            self.assertEqual(3, restored.available_spaces())
+            restored._journal.close()
+
+    def test_restart_from_config_file_keeps_parked_cars(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            config = os.path.join(tmp, "moondalup.json")
+            Path(config).write_text('{"carpark_name": "Moondalup", "capacity": 4}')
+            paths = dict(journal_path=os.path.join(tmp, "events.ndjson"),
+                         snapshot_path=os.path.join(tmp, "snapshot.json"))
+            carpark = CarparkManagement.from_config_file(config, **paths)
+            carpark.handle_entry("ABC123")
+            carpark.handle_entry("XYZ789")
+            carpark.close()
+            self.assertTrue(json.loads(Path(paths["snapshot_path"]).read_text())["cars"])
+
+            Path(config).write_text('{"carpark_name": "Moondalup", "capacity": 6}')
+            restarted = CarparkManagement.from_config_file(config, **paths)
+            restarted.handle_exit("ABC123")
+            self.assertEqual((["XYZ789"], 5), ([c.license_plate for c in restarted.get_active_cars()],
+                                               restarted.available_spaces()))
+            restarted.close()
+
+    def test_append_after_torn_line_then_restore_again(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.ndjson")
+            with EventJournal(path, fsync="never") as journal:
+                CarparkManagement(capacity=5, journal=journal).handle_entry("ABC123")
+            with open(path, "a") as f:
+                f.write('{"event":"entry","plate":"TORN')
+
+            journal = EventJournal(path, fsync="never")
+            restored = CarparkManagement.restore(None, journal, capacity=5)
+            restored.handle_entry("XYZ789")
+            journal.close()
+
+            with EventJournal(path, fsync="never") as journal:
+                again = CarparkManagement.restore(None, journal, capacity=5)
+                self.assertEqual(["ABC123", "XYZ789"], [c.license_plate for c in again.get_active_cars()])
+
+    def test_concurrent_snapshots_never_fail_gate_calls(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            snapshot = os.path.join(tmp, "snapshot.json")
+            carpark = CarparkManagement(capacity=10000, snapshot_path=snapshot, snapshot_every=1)
+            errors = []
+
+            def lane(n):
+                for i in range(200):
+                    try:
+                        self.assertTrue(carpark.handle_entry(f"L{n}-{i}"))
+                    except Exception as e:
+                        errors.append(e)
+
+            threads = [threading.Thread(target=lane, args=(n,)) for n in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertEqual([], errors)
+            self.assertEqual(["snapshot.json"], os.listdir(tmp))
+
+    def test_snapshot_every_needs_a_path(self):
+        with self.assertRaises(ValueError):
+            CarparkManagement(capacity=5, snapshot_every=10)
+
+
+if __name__=="__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+import sys,os
+import tempfile
+from pathlib import Path
+cwd = Path(os.path.dirname(__file__))
+parent = str(cwd.parent)
+
+sys.path.append(parent + "/the_project")
+
+from carpark_log_analyzer import analyze
+
+
+class TestLogAnalyzer(unittest.TestCase):
+
+    def test_merges_files_and_counts_duplicates(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = Path(tmp, "a.txt")
+            first.write_text("2025-11-26 09:49:20  [IN]  ABC123\n"
+                             "2025-11-26 09:49:20  [IN]  ABC123\n"
+                             "2025-11-26 10:05:00  [IN]  XYZ789\n"
+                             "garbage\n")
+            second = Path(tmp, "b.txt")
+            second.write_text("2025-11-26 10:49:28  [OUT] ABC123")
+            Path(tmp, "empty.txt").write_text("")
+            stats = analyze([str(first), str(second), str(Path(tmp, "empty.txt"))], workers=1)
+            self.assertEqual((5, 1, 1), (stats.lines, stats.malformed, stats.duplicates))
+            self.assertEqual([("2025-11-26 09", 1), ("2025-11-26 10", 1)], stats.occupancy_curve())
+            self.assertEqual({"ABC123": 1, "XYZ789": 1}, dict(stats.visits_per_plate))
+
+
+if __name__=="__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import sys,os
+import tempfile
+import threading
+import time
+from pathlib import Path
+cwd = Path(os.path.dirname(__file__))
+parent = str(cwd.parent)
+
+sys.path.append(parent + "/the_project")
+
+from carpark_manager import CarparkManagement
+from carpark_logfile import BackgroundLogWriter, log_events
+
+
+class StuckSegments:
+    """A log sink whose writes hang until released, like a stalled disk."""
+    def __init__(self, release):
+        self.release = release
+
+    def write(self, line, when):
+        self.release.wait()
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TestBackgroundLogWriter(unittest.TestCase):
+
+    def test_lines_written_on_close(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "carpark_log.txt")
+            writer = BackgroundLogWriter(path, flush_interval=60)
+            writer.write("[IN]  ABC123")
+            writer.write("[OUT] ABC123")
+            writer.close()
+            lines = Path(path).read_text().splitlines()
+            self.assertEqual(2, len(lines))
+            self.assertTrue(lines[0].endswith("  [IN]  ABC123"))
+
+    def test_only_accepted_events_are_logged(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "carpark_log.txt")
+            carpark = CarparkManagement(capacity=1)
+            with BackgroundLogWriter(path) as writer:
+                log_events(carpark, writer)
+                carpark.handle_entry("ABC123")
+                carpark.handle_entry("XYZ789")   # full
+                carpark.handle_exit("NOTIN")
+                carpark.handle_exit("ABC123")
+            lines = [line.split("  ", 1)[1] for line in Path(path).read_text().splitlines()]
+            self.assertEqual(["[IN]  ABC123", "[OUT] ABC123"], lines)
+
+    def test_failed_writes_are_reported(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # a directory cannot be opened for appending: the writer thread stops
+            with self.assertLogs("carpark_logfile", level="ERROR"):
+                writer = BackgroundLogWriter(tmp)
+                deadline = time.monotonic() + 5.0
+                while writer.error is None and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            with self.assertRaises(RuntimeError):
+                writer.write("[IN]  ABC123")
+            writer.close()
+
+    def test_slow_disk_drops_instead_of_queueing_forever(self):
+        release = threading.Event()
+        writer = BackgroundLogWriter(segments=StuckSegments(release), flush_lines=1, max_queued=2)
+        try:
+            for _ in range(4):   # at most one in the writer's hands plus two queued
+                writer.write("[IN]  ABC123")
+            self.assertGreaterEqual(writer.dropped, 1)
+        finally:
+            release.set()
+            writer.close()
+
+
+if __name__=="__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import sys,os
+import io
+from pathlib import Path
+cwd = Path(os.path.dirname(__file__))
+parent = str(cwd.parent)
+
+sys.path.append(parent + "/the_project")
+
+from carpark_manager import CarparkManagement
+from carpark_sensors import DebounceFilter, EntrySensor, ExitSensor
+import carpark_main
+
+
+class TestReplay(unittest.TestCase):
+
+    def test_replay_stream_through_sensors(self):
+        carpark = CarparkManagement(capacity=1, keep_log=False)
+        stream = io.StringIO("enter A1 Toyota Camry\n"
+                             "2025-11-26T09:00:00 enter B2\n"
+                             "2025-11-26 09:49:28  [OUT] A1\n"
+                             "bogus line\n")
+        summary = carpark_main.replay(carpark, EntrySensor(carpark.handle_entry),
+                                      ExitSensor(carpark.handle_exit), stream)
+        self.assertEqual(3, summary["events"])
+        self.assertEqual(1, summary["malformed"])
+        self.assertEqual({"entry": 1, "entry_rejected_full": 1, "exit": 1}, summary["outcomes"])
+        self.assertEqual(1, carpark.available_spaces())
+
+    def test_debounce_drops_doubled_log_lines(self):
+        carpark = CarparkManagement(capacity=5)
+        stream = io.StringIO("2025-11-26 09:49:20  [IN]  A1\n"
+                             "2025-11-26 09:49:20  [IN]  A1\n"
+                             "2025-11-26 09:49:28  [OUT] A1\n"
+                             "2025-11-26 09:49:29  [OUT] A1\n"
+                             "2025-11-26 09:49:35  [IN]  A1\n")
+        entry = EntrySensor(carpark.handle_entry, debounce=DebounceFilter(2.0))
+        exit_ = ExitSensor(carpark.handle_exit, debounce=DebounceFilter(2.0))
+        summary = carpark_main.replay(carpark, entry, exit_, stream)
+        self.assertEqual({"entry": 2, "exit": 1}, summary["outcomes"])
+        self.assertEqual(2, entry.debounce.dropped + exit_.debounce.dropped)
+
+
+if __name__=="__main__":
+    unittest.main()
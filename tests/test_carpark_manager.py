@@ -0,0 +1,130 @@
+import unittest
+import sys,os
+import threading
+from datetime import datetime
+from pathlib import Path
+cwd = Path(os.path.dirname(__file__))
+parent = str(cwd.parent)
+
+sys.path.append(parent + "/the_project")
+
+from carpark_manager import CarparkManagement
+
+T0 = datetime(2025, 11, 26, 8, 0)
+
+
+class TestCarparkManagement(unittest.TestCase):
+
+    def test_entry_and_exit(self):
+        carpark = CarparkManagement(capacity=2)
+        self.assertTrue(carpark.handle_entry("ABC123"))
+        self.assertEqual(1, carpark.available_spaces())
+        self.assertTrue(carpark.handle_exit("ABC123"))
+        self.assertEqual(2, carpark.available_spaces())
+
+    def test_rejects_duplicate_and_full(self):
+        carpark = CarparkManagement(capacity=1)
+        carpark.handle_entry("ABC123")
+        self.assertFalse(carpark.handle_entry("ABC123"))
+        self.assertFalse(carpark.handle_entry("XYZ789"))
+        self.assertFalse(carpark.handle_exit("NOTIN"))
+        events = [e["event"] for e in carpark.get_log()]
+        self.assertEqual(["entry", "entry_rejected_already_in", "entry_rejected_full",
+                          "exit_rejected_not_found"], events)
+
+    def test_batch_entries_and_exits(self):
+        carpark = CarparkManagement(capacity=2)
+        when = datetime(2025, 11, 26, 9, 0)
+        results = carpark.handle_entries([("ABC123", "Mazda 3", when), ("ABC123", None, when),
+                                          ("XYZ789", None, None), ("NEW001", None, when)])
+        self.assertEqual([True, False, True, False], results)
+        self.assertEqual([True, False], carpark.handle_exits([("ABC123", None), ("NOTIN", when)]))
+        self.assertEqual(6, len(carpark.get_log()))
+        self.assertEqual(["XYZ789"], [c.license_plate for c in carpark.get_active_cars()])
+
+    def test_active_views_are_live(self):
+        carpark = CarparkManagement(capacity=5)
+        plates = carpark.active_plates()
+        carpark.handle_entry("ABC123")
+        self.assertIn("ABC123", plates)
+        self.assertEqual(1, carpark.occupied())
+        self.assertFalse(hasattr(next(iter(carpark.active_cars())), "__dict__"))
+
+    def test_query_indexes(self):
+        carpark = CarparkManagement(capacity=10)
+        carpark.handle_entries([("ABC123", "Mazda 3", T0), ("ABD999", None, T0.replace(hour=9)),
+                                ("XYZ789", "Mazda 3", T0.replace(hour=10))])
+        carpark.handle_exit("ABD999")
+        self.assertTrue(carpark.is_parked("ABC123"))
+        self.assertFalse(carpark.is_parked("ABD999"))
+        self.assertEqual(["ABC123"], carpark.plates_with_prefix("AB"))
+        self.assertEqual(["ABC123", "XYZ789"], carpark.plates_with_prefix(""))
+        self.assertEqual({"ABC123", "XYZ789"}, {c.license_plate for c in carpark.cars_by_model("Mazda 3")})
+        self.assertEqual([], carpark.cars_by_model(None))
+        cars = carpark.cars_entered_between(T0.replace(hour=9), T0.replace(hour=10))
+        self.assertEqual(["XYZ789"], [c.license_plate for c in cars])
+
+    def test_subscribers_get_events(self):
+        carpark = CarparkManagement(capacity=1)
+        seen = []
+        unsubscribe = carpark.subscribe(lambda e: seen.append(e["event"]))
+        carpark.handle_entry("ABC123")
+        carpark.handle_entries([("XYZ789", None, None)])
+        carpark.temperature_reading(23.5)
+        unsubscribe()
+        carpark.handle_exit("ABC123")
+        self.assertEqual(["entry", "entry_rejected_full", "temperature"], seen)
+
+    def test_failing_subscriber_does_not_fail_gate_call(self):
+        carpark = CarparkManagement(capacity=1)
+        seen = []
+        carpark.subscribe(lambda e: 1 / 0)
+        carpark.subscribe(lambda e: seen.append(e["event"]))
+        with self.assertLogs("carpark_manager", level="ERROR"):
+            self.assertTrue(carpark.handle_entry("ABC123"))
+        self.assertEqual(["entry"], seen)
+
+    def test_concurrent_lanes_never_oversell(self):
+        # fewer bays than lanes, so the lanes keep racing for the last free bay
+        carpark = CarparkManagement(capacity=4, keep_log=False)
+        kept = []        # accepted and left inside
+        occupancy = []   # occupancy seen right after each accepted entry
+        errors = []
+        start = threading.Barrier(8)
+
+        def lane(n):
+            start.wait()
+            try:
+                for i in range(5000):
+                    plate = f"L{n}-{i}"
+                    if carpark.handle_entry(plate):
+                        occupancy.append(carpark.occupied())
+                        if i < 4900:
+                            carpark.handle_exit(plate)
+                        else:
+                            kept.append(plate)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=lane, args=(n,)) for n in range(8)]
+        # switch threads as often as possible, so an unlocked check-then-insert
+        # would be interleaved and oversell
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        # asserted here: a failed assert inside a lane thread would not fail the test
+        self.assertEqual([], errors)
+        self.assertLessEqual(max(occupancy), carpark.capacity)
+        self.assertEqual(carpark.capacity, len(kept))
+        self.assertEqual(carpark.capacity, carpark.occupied())
+        self.assertEqual(sorted(kept), sorted(c.license_plate for c in carpark.get_active_cars()))
+
+
+if __name__=="__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import sys,os
+from pathlib import Path
+cwd = Path(os.path.dirname(__file__))
+parent = str(cwd.parent)
+
+sys.path.append(parent + "/the_project")
+
+from carpark_manager import CarparkManagement
+from carpark_sensors import EntrySensor
+from carpark_metrics import MetricsRegistry, instrument_manager, instrument_sensor
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_counts_and_latency_histograms(self):
+        carpark = CarparkManagement(capacity=1)
+        metrics = MetricsRegistry()
+        instrument_manager(carpark, metrics)
+        sensor = EntrySensor(carpark.handle_entry)
+        instrument_sensor(sensor, metrics, "entry")
+        sensor.detect("ABC123")
+        sensor.detect("ABC123")
+        carpark.handle_exit("NOTIN")
+        text = metrics.render()
+        self.assertIn('carpark_events_total{kind="entry",outcome="accepted"} 1', text)
+        self.assertIn('carpark_events_total{kind="entry",outcome="rejected_duplicate"} 1', text)
+        self.assertIn('carpark_events_total{kind="exit",outcome="not_found"} 1', text)
+        self.assertIn('carpark_manager_event_seconds_count{kind="entry"} 2', text)
+        self.assertIn('carpark_sensor_to_state_seconds_bucket{kind="entry",le="+Inf"} 2', text)
+
+    def test_batches_are_timed_and_counted(self):
+        carpark = CarparkManagement(capacity=2)
+        metrics = MetricsRegistry()
+        instrument_manager(carpark, metrics)
+        carpark.handle_entries([("ABC123", None, None), ("XYZ789", None, None), ("NEW001", None, None)])
+        carpark.handle_exits([("ABC123", None), ("NOTIN", None)])
+        text = metrics.render()
+        self.assertIn('carpark_events_total{kind="entry",outcome="accepted"} 2', text)
+        self.assertIn('carpark_events_total{kind="entry",outcome="rejected_full"} 1', text)
+        self.assertIn('carpark_events_total{kind="exit",outcome="not_found"} 1', text)
+        self.assertIn('carpark_manager_batch_seconds_count{kind="entry"} 1', text)
+        self.assertIn('carpark_manager_batch_seconds_count{kind="exit"} 1', text)
+
+
+if __name__=="__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import sys,os
+from datetime import datetime
+from pathlib import Path
+cwd = Path(os.path.dirname(__file__))
+parent = str(cwd.parent)
+
+sys.path.append(parent + "/the_project")
+
+from carpark_manager import CarparkManagement
+from carpark_occupancy import OccupancyIndex
+
+T0 = datetime(2025, 11, 26, 8, 0)
+
+
+class TestOccupancyIndex(unittest.TestCase):
+
+    def test_point_and_range_queries(self):
+        carpark = CarparkManagement(capacity=5, keep_occupancy=True)
+        carpark.handle_entries([("A", None, T0), ("B", None, T0.replace(hour=9))])
+        carpark.handle_exits([("A", T0.replace(hour=10))])
+        self.assertEqual(0, carpark.occupancy_at(T0.replace(hour=7)))
+        self.assertEqual(2, carpark.occupancy_at(T0.replace(hour=9, minute=30)))
+        self.assertEqual(1, carpark.occupancy_at(T0.replace(hour=11)))
+        stats = carpark.occupancy_between(T0, T0.replace(hour=10))
+        self.assertEqual({"min": 1, "max": 2, "mean": 1.5}, stats)
+
+    def test_rebuild_from_log_with_late_event(self):
+        carpark = CarparkManagement(capacity=5, keep_occupancy=True)
+        carpark.handle_entry("B", when=T0.replace(hour=9))
+        carpark.handle_entry("A", when=T0)
+        index = OccupancyIndex.from_events(carpark.get_log())
+        self.assertEqual(1, index.at(T0.replace(hour=8, minute=30).timestamp()))
+        self.assertEqual(carpark.occupancy.counts, index.counts)
+        self.assertEqual(1.0, index.between(T0.timestamp(), T0.replace(hour=9).timestamp())["mean"])
+
+    def test_disabled_by_default(self):
+        carpark = CarparkManagement(capacity=5)
+        carpark.handle_entry("A", when=T0)
+        self.assertIsNone(carpark.occupancy)
+        with self.assertRaises(ValueError):
+            carpark.occupancy_at(T0)
+
+
+if __name__=="__main__":
+    unittest.main()
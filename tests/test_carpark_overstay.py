@@ -0,0 +1,64 @@
+import unittest
+import sys,os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+cwd = Path(os.path.dirname(__file__))
+parent = str(cwd.parent)
+
+sys.path.append(parent + "/the_project")
+
+from carpark_manager import CarparkManagement
+from carpark_journal import EventJournal
+from carpark_overstay import OverstayTimer
+
+T0 = datetime(2025, 11, 26, 8, 0)
+
+
+class TestOverstay(unittest.TestCase):
+
+    def test_reported_once_and_cancelled_on_exit(self):
+        carpark = CarparkManagement(capacity=5, max_stay=3600)
+        carpark.handle_entry("A", when=T0)
+        carpark.handle_entry("C", when=T0 + timedelta(minutes=10))
+        carpark.handle_entry("B", when=T0 + timedelta(minutes=30))
+        carpark.handle_exit("C", when=T0 + timedelta(minutes=20))
+        self.assertEqual(["A"], carpark.check_overstays(T0 + timedelta(minutes=75)))
+        self.assertEqual([], carpark.check_overstays(T0 + timedelta(minutes=80)))
+        self.assertEqual(T0 + timedelta(minutes=90), carpark.next_overstay())
+        # a gate event past B's deadline reports B before the exit itself
+        carpark.handle_exit("B", when=T0 + timedelta(minutes=100))
+        kinds = [(e["event"], e["plate"]) for e in carpark.get_log()[-3:]]
+        self.assertEqual([("overstay", "A"), ("overstay", "B"), ("exit", "B")], kinds)
+        self.assertIsNone(carpark.next_overstay())
+
+    def test_restore_does_not_report_again(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.ndjson")
+            snapshot = os.path.join(tmp, "snapshot.json")
+            with EventJournal(path, fsync="never") as journal:
+                carpark = CarparkManagement(capacity=5, journal=journal, max_stay=3600)
+                carpark.handle_entry("A", when=T0)
+                carpark.handle_entry("B", when=T0 + timedelta(minutes=30))
+                self.assertEqual(["A"], carpark.check_overstays(T0 + timedelta(minutes=75)))
+                carpark.save_snapshot(snapshot)
+
+            with EventJournal(path, fsync="never") as journal:
+                restored = CarparkManagement.restore(snapshot, journal, max_stay=3600)
+                self.assertEqual(["B"], restored.check_overstays(T0 + timedelta(hours=3)))
+
+    def test_timer_fires_when_due(self):
+        carpark = CarparkManagement(capacity=5, max_stay=0.05)
+        fired = threading.Event()
+        carpark.subscribe(lambda event: event["event"] == "overstay" and fired.set())
+        timer = OverstayTimer(carpark, max_wait=0.02).start()
+        try:
+            carpark.handle_entry("A")
+            self.assertTrue(fired.wait(2))
+        finally:
+            timer.stop()
+
+
+if __name__=="__main__":
+    unittest.main()
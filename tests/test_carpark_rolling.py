@@ -0,0 +1,71 @@
+import unittest
+import sys,os
+import copy
+from datetime import datetime, timedelta
+from pathlib import Path
+cwd = Path(os.path.dirname(__file__))
+parent = str(cwd.parent)
+
+sys.path.append(parent + "/the_project")
+
+from carpark_manager import CarparkManagement
+from carpark_gui_bridge import GUIDataProvider
+
+T0 = datetime(2025, 11, 26, 8, 0)
+
+
+class TestRollingStats(unittest.TestCase):
+
+    def test_window_rates_and_eta(self):
+        carpark = CarparkManagement(capacity=10)
+        carpark.handle_entry("A", when=T0)
+        carpark.handle_entry("B", when=T0 + timedelta(minutes=2))
+        carpark.handle_exit("A", when=T0 + timedelta(minutes=5))
+        stats = carpark.rolling_stats(T0 + timedelta(minutes=10))
+        self.assertAlmostEqual(0.2, stats["arrivals_per_minute"])
+        self.assertAlmostEqual(0.1, stats["departures_per_minute"])
+        # A parked 300 s, B 480 s, over 600 s and 10 bays
+        self.assertAlmostEqual(0.13, stats["occupancy_rate_15m"])
+        self.assertAlmostEqual(0.13, stats["occupancy_rate_1h"])
+        self.assertAlmostEqual(480, stats["mean_dwell_inside"])
+        self.assertAlmostEqual(90 * 60, stats["fill_eta"])
+
+    def test_old_buckets_expire(self):
+        carpark = CarparkManagement(capacity=4)
+        carpark.handle_entries([(p, None, T0) for p in "ABCD"])
+        stats = carpark.rolling_stats(T0 + timedelta(hours=3))
+        self.assertEqual(0, stats["arrivals_per_minute"])
+        self.assertAlmostEqual(1.0, stats["occupancy_rate_15m"])
+        self.assertAlmostEqual(1.0, stats["occupancy_rate_1h"])
+        self.assertIsNone(stats["fill_eta"])
+
+    def test_queries_do_not_change_state(self):
+        carpark = CarparkManagement(capacity=4)
+        carpark.handle_entry("A", when=T0)
+        before = copy.deepcopy(vars(carpark.rolling))
+        carpark.rolling_stats(T0 + timedelta(hours=2))
+        self.assertEqual(before, vars(carpark.rolling))
+        carpark.handle_entry("B", when=T0 + timedelta(minutes=5))
+        self.assertAlmostEqual(2 / 10, carpark.rolling_stats(T0 + timedelta(minutes=10))["arrivals_per_minute"])
+
+
+class TestGUIDataProvider(unittest.TestCase):
+
+    def test_trend_properties_share_one_summary(self):
+        sys.path.append(parent)
+        from smartpark.interfaces import CarparkDataProvider
+        carpark = CarparkManagement(capacity=4)
+        calls = []
+        original = carpark.rolling_stats
+        carpark.rolling_stats = lambda: calls.append(1) or original()
+        provider = GUIDataProvider(carpark, weather_file=os.path.join(parent, "the_project", "weather.json"))
+        self.assertIsInstance(provider, CarparkDataProvider)
+        carpark.handle_entry("A")
+        values = (provider.arrivals_per_minute, provider.departures_per_minute, provider.fill_eta,
+                  provider.occupancy_rate_15m, provider.occupancy_rate_1h, provider.mean_dwell_inside)
+        self.assertEqual(1, len(calls))
+        self.assertGreater(values[0], 0)
+
+
+if __name__=="__main__":
+    unittest.main()
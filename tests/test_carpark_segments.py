@@ -0,0 +1,46 @@
+import unittest
+import sys,os
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+cwd = Path(os.path.dirname(__file__))
+parent = str(cwd.parent)
+
+sys.path.append(parent + "/the_project")
+
+from carpark_logfile import BackgroundLogWriter
+from carpark_segments import SegmentedLog, read_between
+
+
+class TestSegmentedLog(unittest.TestCase):
+
+    def test_rotate_compress_and_query_range(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            segments = SegmentedLog(tmp, max_bytes=400, block_lines=4)
+            writer = BackgroundLogWriter(segments=segments)
+            start = datetime(2025, 11, 26, 7, 0)
+            for minute in range(0, 48 * 60, 30):
+                when = start + timedelta(minutes=minute)
+                writer.write(f"[IN]  P{minute}", when.timestamp())
+            writer.close()
+
+            names = sorted(os.listdir(tmp))
+            self.assertTrue(any(n.startswith("carpark_log-20251127-") for n in names))
+            self.assertFalse([n for n in names if n.endswith(".log")])
+            lines = list(read_between(tmp, "carpark_log", datetime(2025, 11, 27, 8, 0).timestamp(),
+                                      datetime(2025, 11, 27, 9, 0).timestamp()))
+            self.assertEqual(["2025-11-27 08:00:00  [IN]  P1500", "2025-11-27 08:30:00  [IN]  P1530",
+                              "2025-11-27 09:00:00  [IN]  P1560"], lines)
+
+    def test_open_segment_is_queryable_after_flush(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            segments = SegmentedLog(tmp, compress=True)
+            when = datetime(2025, 11, 26, 8, 0).timestamp()
+            segments.write("2025-11-26 08:00:00  [IN]  ABC123\n", when)
+            segments.flush()
+            self.assertEqual(1, len(list(read_between(tmp, "carpark_log", when, when))))
+            segments.close()
+
+
+if __name__=="__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import sys,os
+from datetime import datetime, timedelta
+from pathlib import Path
+cwd = Path(os.path.dirname(__file__))
+parent = str(cwd.parent)
+
+sys.path.append(parent + "/the_project")
+
+from carpark_sensors import DebounceFilter, EntrySensor, ExitSensor
+
+
+class TestDebounceFilter(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 100.0
+        self.seen = []
+        self.sensor = EntrySensor(lambda plate, model: self.seen.append(plate) or True,
+                                  debounce=DebounceFilter(2.0, clock=lambda: self.now))
+
+    def test_repeat_within_window_is_dropped(self):
+        self.assertTrue(self.sensor.detect("ABC123"))
+        self.now = 101.9
+        self.assertIsNone(self.sensor.detect("ABC123"))
+        self.assertTrue(self.sensor.detect("XYZ789"))
+        self.assertEqual(["ABC123", "XYZ789"], self.seen)
+        self.assertEqual(1, self.sensor.debounce.dropped)
+
+    def test_accepted_again_after_window(self):
+        self.sensor.detect("ABC123")
+        self.now = 102.1
+        self.assertTrue(self.sensor.detect("ABC123"))
+        self.now = 110.0
+        self.assertTrue(self.sensor.detect("ABC123"))
+        self.assertEqual(["ABC123"] * 3, self.seen)
+        self.assertEqual(0, self.sensor.debounce.dropped)
+
+    def test_recorded_events_use_their_own_time(self):
+        seen = []
+        sensor = ExitSensor(lambda plate, when: seen.append(when), debounce=DebounceFilter(2.0))
+        when = datetime(2025, 11, 26, 8, 0)
+        sensor.detect("ABC123", when)
+        self.assertIsNone(sensor.detect("ABC123", when + timedelta(seconds=1)))
+        sensor.detect("ABC123", when + timedelta(seconds=3))
+        self.assertEqual([when, when + timedelta(seconds=3)], seen)
+
+
+if __name__=="__main__":
+    unittest.main()
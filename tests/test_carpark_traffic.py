@@ -0,0 +1,44 @@
+import unittest
+import sys,os
+from datetime import datetime, timedelta
+from pathlib import Path
+cwd = Path(os.path.dirname(__file__))
+parent = str(cwd.parent)
+
+sys.path.append(parent + "/the_project")
+
+from carpark_manager import CarparkManagement
+import carpark_main
+from carpark_traffic import TrafficGenerator, VirtualClock, drive, format_event
+
+
+class TestTrafficGenerator(unittest.TestCase):
+
+    def test_seeded_and_time_ordered(self):
+        start = datetime(2025, 11, 1)
+        first = list(TrafficGenerator(50, seed=7).events(start, timedelta(days=2)))
+        second = list(TrafficGenerator(50, seed=7).events(start, timedelta(days=2)))
+        self.assertEqual(first, second)
+        self.assertEqual(sorted(e[0] for e in first), [e[0] for e in first])
+        self.assertTrue(all(start <= e[0] < start + timedelta(days=2) for e in first))
+        when, kind, plate, model = first[0]
+        self.assertEqual((kind, plate, model, when.replace(microsecond=0)),
+                         carpark_main.parse_replay_line(format_event(first[0])))
+
+    def test_drive_manager_on_virtual_clock(self):
+        start = datetime(2025, 11, 1)
+        clock = VirtualClock(start)
+        carpark = CarparkManagement(capacity=50, keep_log=False, clock=clock.now)
+        events = TrafficGenerator(50, seed=7, duplicate_rate=0.2).events(start, timedelta(days=1))
+        counts = drive(carpark, events, clock)
+        self.assertGreater(counts["entries"], 0)
+        self.assertGreater(counts["entries_rejected"], 0)
+        self.assertEqual(counts["entries"] - counts["exits"], carpark.occupied())
+        self.assertLess(start, clock.now())
+        # the manager's "now" is the simulated time, not the wall clock
+        dwell = carpark.rolling_stats()["mean_dwell_inside"]
+        self.assertTrue(0 < dwell < 24 * 3600)
+
+
+if __name__=="__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+"""
+Carpark application entry point, with a headless mode for gate controllers.
+
+    python carpark_app.py --config moondalup.json                 # headless
+    python carpark_app.py --config moondalup.json --gui           # Tk windows
+    python carpark_app.py --config moondalup.json --startup-report --startup-budget 250
+    python carpark_app.py --journal events.ndjson --snapshot snapshot.json --snapshot-every 1000
+
+Headless mode wires the manager, gate ingestion (see carpark_ingest), the text
+log and a status line on stdout, and never imports tkinter. The GUI module is
+only loaded when --gui is given. For a per-module breakdown of import time run
+it under `python -X importtime`.
+"""
+
+import time
+
+_PROCESS_START = time.perf_counter()
+
+import argparse
+import asyncio
+import importlib.util
+import sys
+from pathlib import Path
+
+from carpark_config import ConfigWatcher, load_config
+from carpark_manager import CarparkManagement
+from carpark_ingest import IngestServer
+from carpark_logfile import BackgroundLogWriter, log_events
+from carpark_overstay import OverstayTimer
+from carpark_segments import SegmentedLog
+import carpark_display
+
+HERE = Path(__file__).parent
+GUI_MODULE = HERE / "carpark_no_pi final.py"
+
+
+def load_gui_module():
+    """Import the Tk GUI module on demand (its file name is not importable by name)."""
+    spec = importlib.util.spec_from_file_location("carpark_gui", GUI_MODULE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def status_line(center: CarparkManagement, weather) -> str:
+    temp = weather.read()
+    temp_text = f"{temp} °C" if temp is not None else "N/A"
+    return (f"{time.strftime('%H:%M:%S')}  {center.name}: {center.available_spaces()}/"
+            f"{center.total_spaces()} available, temperature {temp_text}")
+
+
+async def run_headless(center: CarparkManagement, weather_file: str, host: str, port: int,
+                       status_interval: float, log_writer: BackgroundLogWriter, on_ready=None):
+    weather = carpark_display.temperature_source(weather_file)
+
+    log_events(center, log_writer)
+
+    def show_overstay(event):
+        if event["event"] == "overstay":
+            print(f"Overstay: {event['plate']} (in since {event['entry']})", flush=True)
+    center.subscribe(show_overstay)
+
+    server = IngestServer(center, host, port)
+    await server.start()
+    print(f"Listening for gate events on {host}:{server.port}", flush=True)
+    if on_ready is not None:
+        on_ready()
+
+    last = None
+    try:
+        while True:
+            line = status_line(center, weather)
+            # only print when something other than the clock changed
+            if line[10:] != last:
+                print(line, flush=True)
+                last = line[10:]
+            await asyncio.sleep(status_interval)
+    finally:
+        await server.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Smart Carpark")
+    parser.add_argument("--config", default=str(HERE / "moondalup.json"), help="Carpark config file")
+    parser.add_argument("--weather", default=str(HERE / "weather.json"), help="Path to weather.json")
+    parser.add_argument("--gui", action="store_true", help="Open the Tk windows instead of running headless")
+    parser.add_argument("--log", default=str(HERE / "carpark_log.txt"), help="Text log file")
+    parser.add_argument("--log-segments", metavar="DIR", help="Write rotating log segments to DIR instead of --log")
+    parser.add_argument("--max-stay", type=float, default=None, metavar="MINUTES",
+                        help="Report cars parked longer than MINUTES")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Serve Prometheus metrics on this port")
+    parser.add_argument("--watch-config", action="store_true",
+                        help="Apply capacity/name edits of --config while running")
+    parser.add_argument("--journal", metavar="FILE",
+                        help="Append events to FILE and restore the parked cars from it on start-up")
+    parser.add_argument("--snapshot", metavar="FILE", help="Snapshot file, so a restart only replays the journal tail")
+    parser.add_argument("--snapshot-every", type=int, default=0, metavar="N",
+                        help="Write a snapshot every N events (default: only on shutdown)")
+    headless = parser.add_argument_group("headless only")
+    headless.add_argument("--host", default=None, help="Address for gate connections (default: localhost)")
+    headless.add_argument("--port", type=int, default=None, help="Port for gate connections (default: config or 1883)")
+    headless.add_argument("--status-interval", type=float, default=None, help="Seconds between status checks (default: 1)")
+    headless.add_argument("--startup-report", action="store_true", help="Print how long start-up took")
+    headless.add_argument("--startup-budget", type=float, default=None, metavar="MS",
+                          help="Exit with an error if start-up takes longer than MS milliseconds")
+    args = parser.parse_args(argv)
+    max_stay = args.max_stay * 60 if args.max_stay else None
+    if (args.snapshot or args.snapshot_every) and not args.journal:
+        parser.error("--snapshot and --snapshot-every need --journal")
+    if args.snapshot_every and not args.snapshot:
+        parser.error("--snapshot-every needs --snapshot")
+    persistence = dict(journal_path=args.journal, snapshot_path=args.snapshot, snapshot_every=args.snapshot_every)
+
+    if args.gui:
+        given = [flag for flag, value in (("--host", args.host), ("--port", args.port),
+                                          ("--status-interval", args.status_interval),
+                                          ("--startup-report", args.startup_report or None),
+                                          ("--startup-budget", args.startup_budget)) if value is not None]
+        if given:
+            parser.error(f"{', '.join(given)} cannot be used with --gui")
+        load_gui_module().start_gui(config_path=args.config, weather_file=args.weather, log_file=args.log,
+                                    max_stay=max_stay, metrics_port=args.metrics_port,
+                                    log_segments_dir=args.log_segments, watch_config=args.watch_config,
+                                    **persistence)
+        return 0
+
+    config = load_config(args.config)
+    center = CarparkManagement.from_config_file(args.config, max_stay=max_stay, **persistence)
+    if args.journal:
+        print(f"Restored {center.occupied()} parked cars from {args.journal}", flush=True)
+    host = args.host or "localhost"
+    port = args.port if args.port is not None else (config.port or 1883)
+    status_interval = args.status_interval if args.status_interval is not None else 1.0
+    if args.metrics_port is not None:
+        # only pulled in when asked for, to keep start-up lean
+        from carpark_metrics import MetricsRegistry, instrument_manager
+        metrics = MetricsRegistry()
+        instrument_manager(center, metrics)
+        metrics.serve(args.metrics_port)
+    if args.log_segments:
+        log_writer = BackgroundLogWriter(segments=SegmentedLog(args.log_segments))
+    else:
+        log_writer = BackgroundLogWriter(args.log)
+
+    def on_ready():
+        elapsed_ms = (time.perf_counter() - _PROCESS_START) * 1000
+        if args.startup_report:
+            print(f"Started in {elapsed_ms:.1f} ms (tkinter loaded: {'tkinter' in sys.modules})", flush=True)
+        if args.startup_budget is not None and elapsed_ms > args.startup_budget:
+            raise SystemExit(f"Start-up took {elapsed_ms:.1f} ms, over the {args.startup_budget:g} ms budget")
+
+    overstay_timer = OverstayTimer(center).start() if max_stay else None
+    watcher = ConfigWatcher(args.config, center).start() if args.watch_config else None
+    try:
+        asyncio.run(run_headless(center, args.weather, host, port, status_interval,
+                                 log_writer, on_ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if overstay_timer is not None:
+            overstay_timer.stop()
+        if watcher is not None:
+            watcher.stop()
+        log_writer.close()
+        center.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
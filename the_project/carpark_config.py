@@ -0,0 +1,227 @@
+"""
+Carpark configuration: load, validate and watch config files.
+
+Supported formats (picked by file extension):
+    .json   either a flat object ({"carpark_name": ..., "capacity": ...}) or
+            {"CarParks": [{...}, {...}]} with one entry per carpark
+    .toml   the same shapes; a [[CarParks]] array or top level keys
+    other   key = value lines (one carpark), '#' starts a comment
+
+Files are validated once into CarparkConfig objects; ConfigWatcher applies
+capacity/name changes to a running CarparkManagement without a restart.
+"""
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:  # pragma: no cover
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+log = logging.getLogger(__name__)
+
+# accepted spellings, first match wins
+NAME_KEYS = ("carpark_name", "name", "location")
+CAPACITY_KEYS = ("capacity", "total_spaces", "total-spaces", "number_of_spaces", "spaces")
+
+
+@dataclass(frozen=True)
+class CarparkConfig:
+    name: str
+    capacity: int
+    location: Optional[str] = None
+    broker: Optional[str] = None
+    port: Optional[int] = None
+    sensors: Tuple[Dict, ...] = field(default_factory=tuple)
+    displays: Tuple[Dict, ...] = field(default_factory=tuple)
+
+
+def _read_raw(path: Path) -> List[Dict]:
+    text = path.read_text(encoding="utf-8")
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        data = json.loads(text)
+    elif suffix == ".toml":
+        if tomllib is None:
+            raise ValueError(f"{path}: reading TOML needs Python 3.11+ or 'pip install tomli'")
+        data = tomllib.loads(text)
+    else:
+        data = _parse_key_values(text)
+
+    if isinstance(data, dict) and "CarParks" in data:
+        data = data["CarParks"]
+    if isinstance(data, dict):
+        return [data]
+    if isinstance(data, list) and all(isinstance(d, dict) for d in data):
+        return data
+    raise ValueError(f"{path}: expected a carpark object or a CarParks list")
+
+
+def _parse_key_values(text: str) -> Dict:
+    data = {}
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        if "=" not in line:
+            raise ValueError(f"line {number}: expected 'key = value', got {line!r}")
+        key, value = (part.strip() for part in line.split("=", 1))
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        elif value.lstrip("-").isdigit():
+            value = int(value)
+        data[key] = value
+    return data
+
+
+def _first(raw: Dict, keys):
+    for key in keys:
+        if key in raw:
+            return raw[key]
+    return None
+
+
+def _validate(raw: Dict, where: str) -> CarparkConfig:
+    name = _first(raw, NAME_KEYS)
+    capacity = _first(raw, CAPACITY_KEYS)
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError(f"{where}: missing carpark name (one of {', '.join(NAME_KEYS)})")
+    if isinstance(capacity, str) and capacity.strip().isdigit():
+        capacity = int(capacity)
+    if not isinstance(capacity, int) or isinstance(capacity, bool) or capacity < 0:
+        raise ValueError(f"{where}: capacity must be a whole number >= 0, got {capacity!r}")
+    port = raw.get("port")
+    if port is not None and not isinstance(port, int):
+        raise ValueError(f"{where}: port must be a number, got {port!r}")
+    return CarparkConfig(
+        name=name.strip(),
+        capacity=capacity,
+        location=raw.get("location"),
+        broker=raw.get("broker"),
+        port=port,
+        sensors=tuple(raw.get("Sensors", ())),
+        displays=tuple(raw.get("Displays", ())),
+    )
+
+
+def load_configs(path: str) -> List[CarparkConfig]:
+    """Every carpark in the file, validated. Raises ValueError on bad content or repeated names."""
+    p = Path(path)
+    configs = [_validate(raw, f"{p} carpark #{i + 1}") for i, raw in enumerate(_read_raw(p))]
+    seen = set()
+    for config in configs:
+        # carparks are looked up by name (load_config, ConfigWatcher)
+        if config.name in seen:
+            raise ValueError(f"{p}: more than one carpark named {config.name!r}")
+        seen.add(config.name)
+    return configs
+
+
+def load_config(path: str, name: Optional[str] = None) -> CarparkConfig:
+    """One carpark from the file: the one called `name`, or the first."""
+    configs = load_configs(path)
+    if not configs:
+        raise ValueError(f"{path}: no carparks configured")
+    if name is None:
+        return configs[0]
+    for config in configs:
+        if config.name == name:
+            return config
+    raise ValueError(f"{path}: no carpark named {name!r}")
+
+
+class ConfigWatcher:
+    """
+    Polls a config file and applies capacity/name changes to a running
+    manager. An invalid edit is reported in `last_error` and the running
+    configuration is kept. When following a carpark by name, a reload where
+    that name is gone takes the entry at the same position as a rename.
+    """
+    def __init__(self, path: str, manager, name: Optional[str] = None, interval: float = 2.0):
+        """name: which carpark in the file to follow (default: the first one)"""
+        self.path = path
+        self.manager = manager
+        self.name = name
+        self.interval = interval
+        self.last_error: Optional[Exception] = None
+        self._index = self._find(self._load(), name) if name is not None else 0
+        self._stamp = self._file_stamp()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _file_stamp(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _load(self) -> List[CarparkConfig]:
+        try:
+            return load_configs(self.path)
+        except (OSError, ValueError):
+            return []
+
+    @staticmethod
+    def _find(configs: List[CarparkConfig], name: str) -> Optional[int]:
+        for i, config in enumerate(configs):
+            if config.name == name:
+                return i
+        return None
+
+    def check(self) -> bool:
+        """Reload if the file changed. Returns True if a new config was applied."""
+        stamp = self._file_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        try:
+            configs = load_configs(self.path)
+            config = self._pick(configs)
+        except (OSError, ValueError) as e:
+            self.last_error = e
+            log.warning("Keeping the running config: %s", e)
+            return False
+        self.last_error = None
+        if self.name is not None:
+            self.name = config.name
+        self.manager.reconfigure(capacity=config.capacity, name=config.name)
+        log.info("Applied %s: %s, %d bays", self.path, config.name, config.capacity)
+        return True
+
+    def _pick(self, configs: List[CarparkConfig]) -> CarparkConfig:
+        if not configs:
+            raise ValueError(f"{self.path}: no carparks configured")
+        if self.name is None:
+            return configs[0]
+        index = self._find(configs, self.name)
+        if index is None:
+            # renamed in place: same slot in the file, new name
+            index = self._index
+            if index is None or index >= len(configs):
+                raise ValueError(f"{self.path}: no carpark named {self.name!r} and none at its position")
+        self._index = index
+        return configs[index]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="carpark-config-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
@@ -1,6 +1,9 @@
 import json
+import os
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Union
 
 def read_temperature(weather_file: str) -> Optional[float]:
     p = Path(weather_file)
@@ -13,13 +16,59 @@ def read_temperature(weather_file: str) -> Optional[float]:
     except Exception:
         return None
 
-def render_summary(center, weather_file: str):
-    temp = read_temperature(weather_file)
+class TemperatureSource:
+    """
+    Cached reader for weather.json. The file is only stat'ed once per
+    poll_interval, and only re-read and re-parsed when its mtime or size changed.
+    """
+    def __init__(self, weather_file: str, poll_interval: float = 1.0):
+        self.weather_file = Path(weather_file)
+        self.poll_interval = poll_interval
+        self._value: Optional[float] = None
+        self._stamp = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def read(self) -> Optional[float]:
+        now = time.monotonic()
+        if now < self._next_check:
+            return self._value
+        with self._lock:
+            self._next_check = now + self.poll_interval
+            try:
+                st = os.stat(self.weather_file)
+            except OSError:
+                self._stamp = None
+                self._value = None
+                return None
+            stamp = (st.st_mtime_ns, st.st_size)
+            if stamp != self._stamp:
+                self._stamp = stamp
+                self._value = read_temperature(str(self.weather_file))
+            return self._value
+
+
+_sources: Dict[str, TemperatureSource] = {}
+
+
+def temperature_source(weather_file: str, poll_interval: float = 1.0) -> TemperatureSource:
+    """Shared TemperatureSource per file, so the CLI and GUI displays use the same cache."""
+    key = os.path.abspath(weather_file)
+    source = _sources.get(key)
+    if source is None:
+        source = _sources[key] = TemperatureSource(weather_file, poll_interval)
+    return source
+
+
+def render_summary(center, weather: Union[str, TemperatureSource]):
+    if not isinstance(weather, TemperatureSource):
+        weather = temperature_source(weather)
+    temp = weather.read()
     print("="*40)
     print(f"{center.name} — Capacity {center.total_spaces()} — Available {center.available_spaces()}")
     if temp is not None:
         print(f"Current temperature: {temp} °C")
     else:
         print("Temperature: N/A")
-    print(f"Cars parked: {len(center.get_active_cars())}")
+    print(f"Cars parked: {center.occupied()}")
     print("="*40)
\ No newline at end of file
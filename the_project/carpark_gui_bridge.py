@@ -1,32 +1,92 @@
-from carpark_manager import CarparkManagement
-from carpark_sensors import EntrySensor, ExitSensor
-from carpark_display import read_temperature
+import sys
 import time
+from pathlib import Path
+
+from carpark_manager import CarparkManagement
+from carpark_sensors import DebounceFilter, EntrySensor, ExitSensor
+from carpark_display import temperature_source
 
-class GUIDataProvider:
-    def __init__(self, manager: CarparkManagement, weather_file: str):
+try:
+    from smartpark.interfaces import CarparkDataProvider
+except ImportError:
+    # run from the_project/ without smartpark installed: use the checkout next to it
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from smartpark.interfaces import CarparkDataProvider
+
+class GUIDataProvider(CarparkDataProvider):
+    """
+    Feeds the displays. The rolling statistics are computed once and shared
+    by all the trend properties for `stats_max_age` seconds, so a display
+    refresh reading several of them does one pass over the buckets.
+    """
+    def __init__(self, manager: CarparkManagement, weather_file: str = "weather.json",
+                 stats_max_age: float = 0.5):
         self.manager = manager
         self.weather_file = weather_file
-        self.temperature = read_temperature(weather_file) or 22  # fallback
+        self.weather = temperature_source(weather_file)
+        self._manual_temperature = None
+        self.stats_max_age = stats_max_age
+        self._stats = None
+        self._stats_at = 0.0
 
     @property
     def available_spaces(self):
         return self.manager.available_spaces()
 
+    @property
+    def temperature(self):
+        # a reading typed into the GUI wins over weather.json
+        if self._manual_temperature is not None:
+            return self._manual_temperature
+        temp = self.weather.read()
+        return temp if temp is not None else 22  # fallback
+
     @property
     def current_time(self):
         return time.localtime()
 
+    def rolling_stats(self):
+        """CarparkManagement.rolling_stats(), reused for up to stats_max_age seconds."""
+        now = time.monotonic()
+        if self._stats is None or now - self._stats_at >= self.stats_max_age:
+            self._stats = self.manager.rolling_stats()
+            self._stats_at = now
+        return self._stats
+
+    @property
+    def occupancy_rate_15m(self):
+        return self.rolling_stats()["occupancy_rate_15m"]
+
+    @property
+    def occupancy_rate_1h(self):
+        return self.rolling_stats()["occupancy_rate_1h"]
+
+    @property
+    def arrivals_per_minute(self):
+        return self.rolling_stats()["arrivals_per_minute"]
+
+    @property
+    def departures_per_minute(self):
+        return self.rolling_stats()["departures_per_minute"]
+
+    @property
+    def mean_dwell_inside(self):
+        return self.rolling_stats()["mean_dwell_inside"]
+
+    @property
+    def fill_eta(self):
+        return self.rolling_stats()["fill_eta"]
+
     def update_temperature(self, temp: float):
-        self.temperature = temp  # receives temp from GUI
-        
+        self._manual_temperature = temp  # receives temp from GUI
+
 
 class GUISensorConnector:
     """Bridges GUI button events to your existing sensors"""
     def __init__(self, manager: CarparkManagement):
         self.manager = manager
-        self.entry = EntrySensor(callback=self.manager.handle_entry)
-        self.exit = ExitSensor(callback=self.manager.handle_exit)
+        self.entry = EntrySensor(callback=self.manager.handle_entry, debounce=DebounceFilter(2.0))
+        self.exit = ExitSensor(callback=self.manager.handle_exit, debounce=DebounceFilter(2.0))
 
     def incoming_car(self, plate: str):
         self.entry.detect(plate)
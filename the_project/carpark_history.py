@@ -0,0 +1,149 @@
+"""
+Columnar history of completed visits (cars that have entered and left).
+
+Each visit is three numbers stored in flat typed arrays: entry and exit as
+epoch seconds, plus an integer model id. Statistics are computed over whole
+columns; NumPy is used when it is installed, otherwise the same results come
+from plain Python.
+
+The columns are not locked: compute stats on a copy() taken while nothing is
+adding visits (CarparkManagement.visit_stats() does this under its lock).
+"""
+
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+_numpy = False  # not looked up yet
+
+
+def _np():
+    # NumPy is optional and slow to import, so only load it when stats are asked for
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy = numpy
+    return _numpy
+
+
+class VisitHistory:
+    def __init__(self):
+        self.entry = array("d")
+        self.exit = array("d")
+        self.model_id = array("i")
+        # model id -> name; id 0 means "no model"
+        self.models: List[Optional[str]] = [None]
+        self._model_ids: Dict[Optional[str], int] = {None: 0}
+
+    def __len__(self):
+        return len(self.entry)
+
+    def copy(self) -> "VisitHistory":
+        """An independent copy of the columns (three memcpys)."""
+        other = VisitHistory()
+        other.entry = self.entry[:]
+        other.exit = self.exit[:]
+        other.model_id = self.model_id[:]
+        other.models = list(self.models)
+        other._model_ids = dict(self._model_ids)
+        return other
+
+    def add(self, entry: datetime, exit: datetime, model: Optional[str] = None):
+        model_id = self._model_ids.get(model)
+        if model_id is None:
+            model_id = self._model_ids[model] = len(self.models)
+            self.models.append(model)
+        self.entry.append(entry.timestamp())
+        self.exit.append(exit.timestamp())
+        self.model_id.append(model_id)
+
+    def _column(self, column: array):
+        return _np().array(column)
+
+    def dwell_times(self):
+        """Stay length of every visit in seconds (a NumPy array when available)."""
+        np = _np()
+        if np is not None:
+            return self._column(self.exit) - self._column(self.entry)
+        return array("d", (x - e for e, x in zip(self.entry, self.exit)))
+
+    def dwell_stats(self, percentiles: Sequence[float] = (50, 90, 99), model: Optional[str] = None) -> Dict:
+        """Count, mean, min, max and percentiles of stay length in seconds."""
+        np = _np()
+        dwell = self.dwell_times()
+        if model is not None:
+            model_id = self._model_ids.get(model, -1)
+            if np is not None:
+                dwell = dwell[self._column(self.model_id) == model_id]
+            else:
+                dwell = [d for d, m in zip(dwell, self.model_id) if m == model_id]
+        if len(dwell) == 0:
+            return {"count": 0}
+
+        if np is not None:
+            stats = {"count": int(dwell.size), "mean": float(dwell.mean()),
+                     "min": float(dwell.min()), "max": float(dwell.max())}
+            for p, value in zip(percentiles, np.percentile(dwell, percentiles)):
+                stats[f"p{p:g}"] = float(value)
+            return stats
+
+        ordered = sorted(dwell)
+        stats = {"count": len(ordered), "mean": sum(ordered) / len(ordered),
+                 "min": ordered[0], "max": ordered[-1]}
+        for p in percentiles:
+            stats[f"p{p:g}"] = _percentile(ordered, p)
+        return stats
+
+    def hourly_turnover(self) -> List[int]:
+        """Number of departures in each hour of the day (local time), index 0-23."""
+        counts = [0] * 24
+        np = _np()
+        if np is not None:
+            # UTC offsets and DST switches fall on quarter hours, so every exit in
+            # one 15 minute slot has the same local hour: convert each slot once
+            slots, per_slot = np.unique(self._column(self.exit) // 900, return_counts=True)
+            for slot, count in zip(slots.tolist(), per_slot.tolist()):
+                counts[time.localtime(slot * 900).tm_hour] += count
+            return counts
+        for x in self.exit:
+            counts[time.localtime(x).tm_hour] += 1
+        return counts
+
+    def peak_occupancy(self):
+        """
+        Highest number of recorded visits overlapping at once, and when it
+        first happened as (count, epoch seconds). Departures at the same
+        instant as arrivals are counted first.
+        """
+        n = len(self.entry)
+        if n == 0:
+            return 0, None
+        np = _np()
+        if np is not None:
+            times = np.concatenate((self._column(self.exit), self._column(self.entry)))
+            steps = np.concatenate((np.full(n, -1), np.ones(n, dtype=np.int64)))
+            order = np.lexsort((steps, times))
+            running = np.cumsum(steps[order])
+            best = int(running.argmax())
+            return int(running[best]), float(times[order][best])
+
+        events = sorted([(x, -1) for x in self.exit] + [(e, 1) for e in self.entry])
+        running = best = 0
+        best_time = None
+        for t, step in events:
+            running += step
+            if running > best:
+                best, best_time = running, t
+        return best, best_time
+
+
+def _percentile(ordered: List[float], p: float) -> float:
+    # linear interpolation, same as numpy's default
+    k = (len(ordered) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
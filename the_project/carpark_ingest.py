@@ -0,0 +1,198 @@
+"""
+asyncio ingestion layer for gate sensor events.
+
+Each gate connects over a local TCP socket (a stand-in for the MQTT broker in
+the config) and sends one command per line, in the same format as the CLI:
+
+    enter <plate> [model]
+    exit <plate>
+
+Sources push parsed events into a bounded queue. When the queue is full the
+sources stop reading, which pushes back on the gates through the socket, and a
+single consumer drains the queue in micro-batches into CarparkManagement.
+The manager calls take its lock and may fsync the journal, so they run in a
+worker thread and the event loop keeps reading from the gates meanwhile.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
+
+from carpark_manager import CarparkManagement
+
+# (kind, plate, model, when)
+SensorEvent = Tuple[str, str, Optional[str], datetime]
+
+log = logging.getLogger(__name__)
+
+
+def parse_command(line: str) -> Optional[SensorEvent]:
+    """Turn an 'enter'/'exit' line into an event, or None if it is not one."""
+    parts = line.strip().split(maxsplit=2)
+    if len(parts) < 2:
+        return None
+    kind = parts[0].lower()
+    if kind == "enter":
+        model = parts[2] if len(parts) == 3 else None
+        return ("enter", parts[1], model, datetime.now())
+    if kind == "exit":
+        return ("exit", parts[1], None, datetime.now())
+    return None
+
+
+class StreamSensorSource:
+    """Reads gate events from a stream and feeds them to the ingest queue."""
+
+    def __init__(self, reader: asyncio.StreamReader, queue: asyncio.Queue, name: str = "gate"):
+        self.reader = reader
+        self.queue = queue
+        self.name = name
+        self.received = 0
+        self.malformed = 0
+
+    async def run(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            event = parse_command(line.decode("utf-8", errors="replace"))
+            if event is None:
+                self.malformed += 1
+                continue
+            # blocks while the queue is full (backpressure)
+            await self.queue.put(event)
+            self.received += 1
+
+
+class IngestConsumer:
+    """
+    Drains the ingest queue into the manager in micro-batches. A run of
+    events that fails (journal I/O error, ...) is logged and counted in
+    `failed`; the consumer keeps going so the gates are never left blocked.
+    """
+
+    def __init__(self, manager: CarparkManagement, queue: asyncio.Queue, max_batch: int = 256):
+        self.manager = manager
+        self.queue = queue
+        self.max_batch = max_batch
+        self.processed = 0
+        self.accepted = 0
+        self.failed = 0
+        self.batches = 0
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                # batches are applied one at a time, in queue order
+                await loop.run_in_executor(None, self.apply, batch)
+            except Exception:
+                log.exception("Ingest batch of %d events failed", len(batch))
+                self.failed += len(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def apply(self, batch: List[SensorEvent]):
+        # consecutive events of the same kind go through one batch call
+        manager = self.manager
+        start = 0
+        while start < len(batch):
+            kind = batch[start][0]
+            end = start + 1
+            while end < len(batch) and batch[end][0] == kind:
+                end += 1
+            run = batch[start:end]
+            start = end
+            try:
+                if kind == "enter":
+                    results = manager.handle_entries([(plate, model, when) for _, plate, model, when in run])
+                else:
+                    results = manager.handle_exits([(plate, when) for _, plate, _, when in run])
+            except Exception:
+                log.exception("Applying %d %s events failed", len(run), kind)
+                self.failed += len(run)
+                continue
+            self.accepted += sum(results)
+        self.processed += len(batch)
+        self.batches += 1
+
+
+class IngestServer:
+    """Accepts gate connections and runs the consumer for one manager."""
+
+    def __init__(self, manager: CarparkManagement, host: str = "localhost", port: int = 1883,
+                 queue_size: int = 1024, max_batch: int = 256):
+        self.manager = manager
+        self.host = host
+        self.port = port
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.consumer = IngestConsumer(manager, self.queue, max_batch)
+        self.sources: List[StreamSensorSource] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._consumer_task: Optional[asyncio.Task] = None
+        self._gate_tasks: Set[asyncio.Task] = set()  # one per connected gate
+
+    async def start(self):
+        self._consumer_task = asyncio.create_task(self.consumer.run())
+        self._server = await asyncio.start_server(self._handle_gate, self.host, self.port)
+        # port 0 means "pick a free one"
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def _handle_gate(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = writer.get_extra_info("peername")
+        source = StreamSensorSource(reader, self.queue, name=str(peer))
+        self.sources.append(source)
+        task = asyncio.current_task()
+        self._gate_tasks.add(task)
+        try:
+            await source.run()
+        finally:
+            self._gate_tasks.discard(task)
+            writer.close()
+
+    async def drain(self):
+        """Wait until every queued event has been applied to the manager."""
+        await self.queue.join()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            # a gate only hangs up on EOF, and wait_closed() (Python 3.12.1+)
+            # waits for every connection, so close them here
+            gates = list(self._gate_tasks)
+            for task in gates:
+                task.cancel()
+            await asyncio.gather(*gates, return_exceptions=True)
+            await self._server.wait_closed()
+        await self.drain()
+        if self._consumer_task is not None:
+            self._consumer_task.cancel()
+            try:
+                await self._consumer_task
+            except asyncio.CancelledError:
+                pass
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+
+def run_ingest(manager: CarparkManagement, host: str = "localhost", port: int = 1883, **kwargs):
+    """Blocking helper: serve gate connections until interrupted."""
+    server = IngestServer(manager, host, port, **kwargs)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return server
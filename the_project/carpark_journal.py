@@ -0,0 +1,148 @@
+"""
+Append-only event journal for CarparkManagement.
+
+Every entry/exit event is written as one compact JSON object per line (NDJSON)
+through a buffered file handle, so saving only costs the new events instead of
+re-serializing the whole history. With the "interval" policy a background
+thread flushes and fsyncs pending events once the interval has passed, so at
+most `fsync_interval` seconds of events can be lost even when the gates go quiet.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator
+
+# fsync policies
+FSYNC_NEVER = "never"        # leave it to the OS (fastest)
+FSYNC_ALWAYS = "always"      # fsync after every append (safest)
+FSYNC_INTERVAL = "interval"  # fsync at most once every `fsync_interval` seconds
+
+
+class EventJournal:
+    def __init__(self, path: str, fsync: str = FSYNC_INTERVAL,
+                 fsync_interval: float = 1.0, buffer_size: int = 64 * 1024):
+        """
+        path: NDJSON segment file, opened in append mode (a torn last line is cut off first)
+        fsync: one of "never", "always", "interval"
+        """
+        if fsync not in (FSYNC_NEVER, FSYNC_ALWAYS, FSYNC_INTERVAL):
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.path = Path(path)
+        if self.path.exists():
+            truncate_torn_tail(self.path)
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self._file = open(self.path, "a", encoding="utf-8", buffering=buffer_size)
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+        self._encode = json.JSONEncoder(separators=(",", ":")).encode
+        self._dirty = False  # events written since the last sync
+        self._closed = threading.Event()
+        self._syncer = None
+        if fsync == FSYNC_INTERVAL:
+            self._syncer = threading.Thread(target=self._sync_loop, name="carpark-journal-sync", daemon=True)
+            self._syncer.start()
+
+    def append(self, event: Dict):
+        """Write a single event to the journal."""
+        with self._lock:
+            self._file.write(self._encode(event) + "\n")
+            self._maybe_sync()
+
+    def append_many(self, events: Iterable[Dict]):
+        """Write several events with a single buffered write."""
+        encode = self._encode
+        data = "".join(encode(e) + "\n" for e in events)
+        if not data:
+            return
+        with self._lock:
+            self._file.write(data)
+            self._maybe_sync()
+
+    def _maybe_sync(self):
+        self._dirty = True
+        if self.fsync == FSYNC_ALWAYS:
+            self._sync()
+        elif self.fsync == FSYNC_INTERVAL:
+            if time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+        self._dirty = False
+
+    def _sync_loop(self):
+        # interval policy: sync events that no later append has synced
+        while not self._closed.wait(self.fsync_interval):
+            with self._lock:
+                if self._dirty and not self._file.closed:
+                    self._sync()
+
+    def flush(self, sync: bool = True):
+        """Push buffered events to disk (and fsync unless the policy is "never")."""
+        with self._lock:
+            if self._file.closed:
+                return
+            if sync and self.fsync != FSYNC_NEVER:
+                self._sync()
+            else:
+                self._file.flush()
+
+    def tell(self) -> int:
+        """Byte offset of the end of the journal, after flushing buffered events."""
+        with self._lock:
+            self._file.flush()
+            return self._file.tell()
+
+    def close(self):
+        self.flush()
+        self._closed.set()
+        if self._syncer is not None:
+            self._syncer.join()
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def truncate_torn_tail(path, chunk_size: int = 64 * 1024) -> int:
+    """
+    Cut the file back to the end of its last complete line, so new events
+    are not glued onto a record torn by a crash. Returns the bytes removed.
+    """
+    with open(path, "r+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        end = size
+        while end > 0:
+            start = max(0, end - chunk_size)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline != -1:
+                end = start + newline + 1
+                break
+            end = start
+        if end < size:
+            f.truncate(end)
+        return size - end
+
+
+def read_journal(path: str, offset: int = 0) -> Iterator[Dict]:
+    """Stream events back from an NDJSON journal file, starting at byte `offset`."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                # torn write from a crash: the event never fully made it
+                break
+            line = line.strip()
+            if line:
+                yield json.loads(line)
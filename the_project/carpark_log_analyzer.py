@@ -0,0 +1,160 @@
+"""
+Streaming analyzer for carpark_log.txt files.
+
+    python carpark_log_analyzer.py site1/carpark_log.txt site2/*.txt --workers 4
+
+Each file is memory-mapped and scanned line by line, so memory use does not
+grow with file size. Several files are analyzed in parallel in a process pool
+and the per-file results are merged. Expected line format:
+
+    2025-11-26 09:49:20  [IN]  ABC123
+"""
+
+import argparse
+import json
+import mmap
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List
+
+
+@dataclass
+class LogStats:
+    lines: int = 0
+    malformed: int = 0
+    # identical line repeated within the same second (the double-write bug / double-firing cameras)
+    duplicates: int = 0
+    # "YYYY-MM-DD HH" -> cars in / out during that hour
+    ins_per_hour: Counter = field(default_factory=Counter)
+    outs_per_hour: Counter = field(default_factory=Counter)
+    visits_per_plate: Counter = field(default_factory=Counter)
+
+    def merge(self, other: "LogStats") -> "LogStats":
+        self.lines += other.lines
+        self.malformed += other.malformed
+        self.duplicates += other.duplicates
+        self.ins_per_hour.update(other.ins_per_hour)
+        self.outs_per_hour.update(other.outs_per_hour)
+        self.visits_per_plate.update(other.visits_per_plate)
+        return self
+
+    def occupancy_curve(self) -> List[tuple]:
+        """(hour, cars inside at the end of that hour), assuming the log starts empty."""
+        inside = 0
+        curve = []
+        for hour in sorted(set(self.ins_per_hour) | set(self.outs_per_hour)):
+            inside += self.ins_per_hour[hour] - self.outs_per_hour[hour]
+            curve.append((hour, inside))
+        return curve
+
+    def peak_hours(self, top: int = 3) -> List[tuple]:
+        """Busiest hours of the day (00-23) by arrivals."""
+        by_hour = Counter()
+        for hour, count in self.ins_per_hour.items():
+            by_hour[hour[-2:]] += count
+        return by_hour.most_common(top)
+
+
+def iter_lines(path: str) -> Iterator[bytes]:
+    """Yield lines from a memory-mapped file without reading it all in."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            size = len(mm)
+            while start < size:
+                end = mm.find(b"\n", start)
+                if end == -1:
+                    end = size
+                yield mm[start:end]
+                start = end + 1
+
+
+def analyze_lines(lines: Iterable[bytes]) -> LogStats:
+    stats = LogStats()
+    current_second = None
+    seen_this_second = set()
+    for raw in lines:
+        line = raw.rstrip(b"\r ")
+        if not line:
+            continue
+        stats.lines += 1
+        parts = line[19:].split()
+        if len(line) < 20 or len(parts) != 2 or parts[0] not in (b"[IN]", b"[OUT]"):
+            stats.malformed += 1
+            continue
+
+        second = line[:19]
+        if second != current_second:
+            current_second = second
+            seen_this_second.clear()
+        if line in seen_this_second:
+            stats.duplicates += 1
+            continue
+        seen_this_second.add(line)
+
+        hour = line[:13].decode("ascii", errors="replace")
+        if parts[0] == b"[IN]":
+            stats.ins_per_hour[hour] += 1
+            stats.visits_per_plate[parts[1].decode("utf-8", errors="replace")] += 1
+        else:
+            stats.outs_per_hour[hour] += 1
+    return stats
+
+
+def analyze_file(path: str) -> LogStats:
+    return analyze_lines(iter_lines(path))
+
+
+def analyze(paths: List[str], workers: int = None) -> LogStats:
+    """Analyze and merge many files, in parallel when there is more than one."""
+    total = LogStats()
+    if len(paths) <= 1 or workers == 1:
+        for path in paths:
+            total.merge(analyze_file(path))
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for stats in pool.map(analyze_file, paths):
+            total.merge(stats)
+    return total
+
+
+def summary(stats: LogStats, top: int = 10) -> Dict:
+    return {
+        "lines": stats.lines,
+        "malformed": stats.malformed,
+        "duplicates": stats.duplicates,
+        "arrivals": sum(stats.ins_per_hour.values()),
+        "departures": sum(stats.outs_per_hour.values()),
+        "distinct_plates": len(stats.visits_per_plate),
+        "top_plates": stats.visits_per_plate.most_common(top),
+        "peak_hours": stats.peak_hours(3),
+        "occupancy_curve": stats.occupancy_curve(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyze carpark_log.txt files")
+    parser.add_argument("paths", nargs="+", help="Log files")
+    parser.add_argument("--workers", type=int, default=None, help="Processes to use (default: CPU count)")
+    parser.add_argument("--top", type=int, default=10, help="How many plates to list")
+    parser.add_argument("--json", action="store_true", help="Print the full result as JSON")
+    args = parser.parse_args()
+
+    result = summary(analyze(args.paths, args.workers), args.top)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"Lines: {result['lines']}  (malformed {result['malformed']}, duplicates {result['duplicates']})")
+        print(f"Arrivals: {result['arrivals']}  Departures: {result['departures']}  "
+              f"Distinct plates: {result['distinct_plates']}")
+        print("Peak hours:", ", ".join(f"{h}:00 ({n} in)" for h, n in result["peak_hours"]))
+        print("Most frequent plates:")
+        for plate, visits in result["top_plates"]:
+            print(f"  {plate:12} {visits}")
+        print("Occupancy at end of hour:")
+        for hour, inside in result["occupancy_curve"]:
+            print(f"  {hour}:00  {inside}")
@@ -0,0 +1,149 @@
+"""
+Background writer for the plain text carpark log (carpark_log.txt).
+
+Callers only put lines on a queue; a single writer thread batches them and
+appends them to the file, so GUI handlers never wait on disk I/O. Give it a
+SegmentedLog instead of a path to get rotating, compressed, indexed segments.
+
+log_events() subscribes a writer to a manager, so every entry point writes
+the same lines: accepted entries and exits only.
+"""
+
+import logging
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from carpark_segments import SegmentedLog
+
+log = logging.getLogger(__name__)
+
+_STOP = object()
+
+# manager event -> log line tag
+LOG_TAGS = {"entry": "[IN] ", "exit": "[OUT]"}
+
+
+class BackgroundLogWriter:
+    def __init__(self, path=None, flush_lines: int = 256, flush_interval: float = 0.5,
+                 segments: Optional[SegmentedLog] = None, max_queued: int = 100_000):
+        """
+        path: log file, created if missing and appended to
+        flush_lines: write out once this many lines are waiting
+        flush_interval: seconds after which waiting lines are written anyway
+        segments: write to rotating segments instead of `path`
+        max_queued: lines waiting for the disk beyond this are dropped (counted in `dropped`)
+        """
+        if (path is None) == (segments is None):
+            raise ValueError("Give either a path or segments")
+        self.path = Path(path) if path is not None else None
+        self.segments = segments
+        self.flush_lines = flush_lines
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queued)
+        self.dropped = 0     # lines lost to a full queue or a failed write
+        self.error: Optional[BaseException] = None  # why the writer thread stopped, if it did
+        self._thread = threading.Thread(target=self._run, name="carpark-log-writer", daemon=True)
+        self._closed = False
+        self._thread.start()
+
+    def write(self, message: str, when: Optional[float] = None):
+        """
+        Queue a log line. The timestamp is taken now, not when the line hits the disk.
+        Never blocks: if the disk has fallen max_queued lines behind, the line is dropped.
+        """
+        if self._closed:
+            raise ValueError("Log writer is closed")
+        if self.error is not None:
+            raise RuntimeError(f"Log writer stopped: {self.error}") from self.error
+        when = time.time() if when is None else when
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(when))
+        try:
+            self._queue.put_nowait((when, f"{timestamp}  {message}\n"))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """Write out everything still queued and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        try:
+            self._write_loop()
+        except BaseException as e:
+            self.error = e
+            log.exception("Log writer stopped")
+            # nothing will read the queue any more
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+    def _write_loop(self):
+        pending = []
+        deadline = None
+        f = open(self.path, "a", encoding="utf-8") if self.segments is None else None
+        try:
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+
+                if item is _STOP:
+                    break
+                if item is not None:
+                    pending.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+
+                if pending and (len(pending) >= self.flush_lines or time.monotonic() >= deadline):
+                    self._write_batch(f, pending)
+                    pending.clear()
+                    deadline = None
+
+            # drain whatever arrived before the stop marker
+            self._write_batch(f, pending)
+        finally:
+            if f is not None:
+                f.close()
+            else:
+                self.segments.close()
+
+    def _write_batch(self, f, pending):
+        # a failed write (e.g. disk full) loses this batch, not the writer
+        try:
+            if f is not None:
+                f.write("".join(line for _, line in pending))
+                f.flush()
+                return
+            for when, line in pending:
+                self.segments.write(line, when)
+            self.segments.flush()
+        except OSError:
+            log.exception("Could not write %d log lines", len(pending))
+            self.dropped += len(pending)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def log_events(manager, writer: BackgroundLogWriter):
+    """Write accepted entries and exits of `manager` to `writer`. Returns the unsubscribe function."""
+    def write(event):
+        tag = LOG_TAGS.get(event["event"])
+        if tag is not None:
+            writer.write(f"{tag} {event['plate']}")
+    return manager.subscribe(write)
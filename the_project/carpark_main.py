@@ -3,20 +3,136 @@ Simple CLI entry point to control and test the carpark system.
 """
 
 import argparse
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 import sys
+import time
 
 from carpark_manager import CarparkManagement
-from carpark_sensors import EntrySensor, ExitSensor
-import carpark_display
+from carpark_sensors import DebounceFilter, EntrySensor, ExitSensor
+import carpark_display as display
+from carpark_metrics import MetricsRegistry, instrument_manager, instrument_sensor
+
+def parse_replay_line(line: str):
+    """
+    Parse one recorded event. Accepted forms:
+        enter <plate> [model]             exit <plate>
+        <iso-time> enter <plate> [model]  <iso-time> exit <plate>
+        2025-11-26 09:49:20  [IN]  ABC123      (carpark_log.txt)
+    Returns (kind, plate, model, when) with when=None if the line has no time, or None.
+    """
+    parts = line.split()
+    if not parts or parts[0].startswith("#"):
+        return None
+    when = None
+    if len(parts) >= 4 and parts[2] in ("[IN]", "[OUT]"):
+        try:
+            when = datetime.fromisoformat(f"{parts[0]} {parts[1]}")
+        except ValueError:
+            return None
+        return ("enter" if parts[2] == "[IN]" else "exit", parts[3], None, when)
+    if parts[0] not in ("enter", "exit"):
+        try:
+            when = datetime.fromisoformat(parts[0])
+        except ValueError:
+            return None
+        parts = parts[1:]
+    if len(parts) < 2 or parts[0] not in ("enter", "exit"):
+        return None
+    model = None
+    if parts[0] == "enter" and len(parts) > 2:
+        model = " ".join(parts[2:])
+    return (parts[0], parts[1], model, when)
+
+
+def replay(center: CarparkManagement, entry_sensor: EntrySensor, exit_sensor: ExitSensor,
+           stream, speed: float = None):
+    """
+    Push recorded events from `stream` through the sensors as fast as possible,
+    or, with `speed`, at `speed` x the recorded rate (timestamped lines only).
+    Returns a summary dict.
+    """
+    outcomes = Counter()
+    unsubscribe = center.subscribe(lambda event: outcomes.update((event["event"],)))
+    events = malformed = 0
+    first_when = None
+    start = time.perf_counter()
+    try:
+        for line in stream:
+            parsed = parse_replay_line(line)
+            if parsed is None:
+                if line.strip() and not line.lstrip().startswith("#"):
+                    malformed += 1
+                continue
+            kind, plate, model, when = parsed
+            if speed and when is not None:
+                if first_when is None:
+                    first_when = when
+                delay = (when - first_when).total_seconds() / speed - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            if kind == "enter":
+                entry_sensor.detect(plate, model, when)
+            else:
+                exit_sensor.detect(plate, when)
+            events += 1
+    finally:
+        unsubscribe()
+    elapsed = time.perf_counter() - start
+    return {
+        "events": events,
+        "malformed": malformed,
+        "seconds": elapsed,
+        "events_per_sec": events / elapsed if elapsed > 0 else float("inf"),
+        "outcomes": dict(outcomes),
+    }
+
+
+def run_replay(config_path: str, weather_file: str, source: str, speed: float = None,
+               metrics_path: str = None, debounce: float = 0):
+    center = CarparkManagement.from_config_file(config_path, keep_log=False)
+    metrics = None
+    if metrics_path:
+        metrics = MetricsRegistry()
+        instrument_manager(center, metrics)
+    entry_sensor = EntrySensor(callback=center.handle_entry,
+                               debounce=DebounceFilter(debounce) if debounce else None)
+    exit_sensor = ExitSensor(callback=center.handle_exit,
+                             debounce=DebounceFilter(debounce) if debounce else None)
+    if metrics is not None:
+        instrument_sensor(entry_sensor, metrics, "entry")
+        instrument_sensor(exit_sensor, metrics, "exit")
+
+    if source == "-":
+        summary = replay(center, entry_sensor, exit_sensor, sys.stdin, speed)
+    else:
+        with open(source, encoding="utf-8") as stream:
+            summary = replay(center, entry_sensor, exit_sensor, stream, speed)
+
+    print(f"Replayed {summary['events']} events in {summary['seconds']:.3f}s "
+          f"({summary['events_per_sec']:,.0f} events/sec)")
+    for outcome, count in sorted(summary["outcomes"].items()):
+        print(f"  {outcome:28} {count}")
+    if summary["malformed"]:
+        print(f"  {'malformed lines':28} {summary['malformed']}")
+    if debounce:
+        dropped = entry_sensor.debounce.dropped + exit_sensor.debounce.dropped
+        print(f"  {'repeats dropped (debounce)':28} {dropped}")
+    display.render_summary(center, weather_file)
+    if metrics is not None:
+        metrics.write(metrics_path)
+        print(f"Metrics written to {metrics_path}")
+    return summary
+
 
 def main(config_path: str, weather_file: str):
     center = CarparkManagement.from_config_file(config_path)
+    weather = display.temperature_source(weather_file)
 
     # Create sensors and wire them to the management center callbacks
-    entry_sensor = EntrySensor(callback=lambda plate, model=None: center.handle_entry(plate, model))
-    exit_sensor = ExitSensor(callback=lambda plate: center.handle_exit(plate))
+    entry_sensor = EntrySensor(callback=lambda plate, model=None, when=None: center.handle_entry(plate, model, when))
+    exit_sensor = ExitSensor(callback=lambda plate, when=None: center.handle_exit(plate, when))
 
     print(f"Loaded {center}")
     print("Commands:")
@@ -52,7 +168,7 @@ def main(config_path: str, weather_file: str):
             accepted = entry_sensor.detect(plate, model)
             # EntrySensor.detect returns None (callback handles business logic).
             # We'll show result using management center state:
-            if plate in [c.license_plate for c in center.get_active_cars()]:
+            if center.is_parked(plate):
                 print(f"Entered: {plate}")
             else:
                 print(f"Entry rejected for {plate} (maybe full or duplicate).")
@@ -65,13 +181,13 @@ def main(config_path: str, weather_file: str):
             exit_sensor.detect(plate)
             # Check log to see if exit was processed
             # Quick check:
-            if plate in [c.license_plate for c in center.get_active_cars()]:
+            if center.is_parked(plate):
                 print(f"Exit not registered for {plate}.")
             else:
                 print(f"Exit processed for {plate} (if it was inside).")
 
         elif parts[0] == "status":
-            display.render_summary(center, weather_file)
+            display.render_summary(center, weather)
 
         elif parts[0] == "log":
             for item in center.get_log():
@@ -106,7 +222,7 @@ def main(config_path: str, weather_file: str):
                     exit_sensor.detect(plate)
                     print(f"Simulated exit {plate}")
             print("Simulation finished.")
-            display.render_summary(center, weather_file)
+            display.render_summary(center, weather)
 
         else:
             print("Unknown command. Type 'status' or 'simulate' or 'quit'.")
@@ -115,6 +231,12 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Smart Carpark CLI")
     parser.add_argument("--config", default="moondalup_carpark\\the_project\\moondalup.json", help="Locates moondalup.json")
     parser.add_argument("--weather", default="moondalup_carpark\\the_project\\weather.json", help="Path to weather.json")
+    parser.add_argument("--replay", metavar="FILE", help="Replay enter/exit commands from FILE ('-' for stdin) and exit")
+    parser.add_argument("--speed", type=float, default=None,
+                        help="With --replay: play timestamped events at SPEED x real time (default: as fast as possible)")
+    parser.add_argument("--metrics", metavar="FILE", help="With --replay: write Prometheus-style latency metrics to FILE")
+    parser.add_argument("--debounce", type=float, default=0, metavar="SECONDS",
+                        help="With --replay: drop repeat detections of a plate within SECONDS")
     args = parser.parse_args()
     print("Looking for config file:", args.config)
 
@@ -122,4 +244,7 @@ if __name__ == "__main__":
         print(f"Config file {args.config} not found. Create one (see project README).")
         sys.exit(1)
 
-    main(args.config, args.weather)
\ No newline at end of file
+    if args.replay:
+        run_replay(args.config, args.weather, args.replay, args.speed, args.metrics, args.debounce)
+    else:
+        main(args.config, args.weather)
\ No newline at end of file
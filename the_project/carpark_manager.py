@@ -1,25 +1,115 @@
+import bisect
 import json
+import logging
+import os
+import sys
+import tempfile
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 from car_models import Car
+from carpark_config import load_config
+from carpark_journal import EventJournal, read_journal
+from carpark_history import VisitHistory
+from carpark_occupancy import OccupancyIndex
+from carpark_rolling import RollingStats
+from carpark_overstay import OverstayTracker
+
+log = logging.getLogger(__name__)
 
 class CarparkManagement:
-    def __init__(self, capacity: int, name: str = "Carpark"):
+    def __init__(self, capacity: int, name: str = "Carpark",
+                 journal: Optional[EventJournal] = None, keep_log: bool = True,
+                 snapshot_path: Optional[str] = None, snapshot_every: int = 0,
+                 max_stay: Optional[float] = None, keep_history: bool = False,
+                 keep_occupancy: bool = False, clock: Callable[[], datetime] = datetime.now):
+        """
+        journal: optional append-only journal that receives every event
+        keep_log: set to False to stop keeping events in memory (use with a journal)
+        snapshot_path, snapshot_every: write a snapshot every N events (0 = never)
+        max_stay: seconds a car may stay; longer stays are recorded as "overstay" events
+        keep_history: keep every completed visit in self.history (grows with traffic)
+        keep_occupancy: keep an occupancy timeline for occupancy_at/occupancy_between (grows with traffic)
+        clock: returns the current time for calls that don't pass one (e.g. carpark_traffic.VirtualClock.now)
+        """
         self.name = name
         self.capacity = capacity
+        self.clock = clock
         # cars currently inside, keyed by license_plate
         self._active_cars: Dict[str, Car] = {}
         # log of events (entry/exit)
         self._log: List[Dict] = []
+        self._journal = journal
+        self.keep_log = keep_log
+        # serializes state changes coming from concurrent entry/exit lanes
+        self._lock = threading.Lock()
+        # events collected during a batch call, written out together at the end
+        self._pending: Optional[List[Dict]] = None
+        # completed visits, for dwell-time and turnover statistics
+        self.history: Optional[VisitHistory] = VisitHistory() if keep_history else None
+        # occupancy over time, for "how many cars were parked at t" queries
+        self.occupancy: Optional[OccupancyIndex] = OccupancyIndex() if keep_occupancy else None
+        # per-minute arrivals/departures/occupancy over the last hour
+        self.rolling = RollingStats()
+        # entry deadlines of the cars inside, when a maximum stay is set
+        self.overstays = OverstayTracker(max_stay) if max_stay else None
+        if snapshot_every and snapshot_path is None:
+            raise ValueError("snapshot_every needs a snapshot_path")
+        self.snapshot_path = snapshot_path
+        self.snapshot_every = snapshot_every
+        self._events_since_snapshot = 0
+        # one snapshot at a time, so an older one never replaces a newer one
+        self._snapshot_lock = threading.Lock()
+        # secondary indexes over the cars inside, kept in step with _active_cars
+        self._sorted_plates: List[str] = []
+        self._by_model: Dict[Optional[str], Set[str]] = {}
+        self._by_entry: List[Tuple[float, str]] = []
+        # change listeners, and events waiting to be published to them
+        self._subscribers: List[Callable[[Dict], None]] = []
+        self._outbox: List[Dict] = []
 
     @classmethod
-    def from_config_file(cls, config_path: str):
-        p = Path(config_path)
-        data = json.loads(p.read_text())
-        return cls(capacity=data.get("capacity", 0), name=data.get("carpark_name", "Carpark"))
+    def from_config_file(cls, config_path: str, carpark: Optional[str] = None,
+                         journal_path: Optional[str] = None, **kwargs):
+        """
+        Build a manager from a JSON/TOML/key=value config (see carpark_config).
+        With a journal_path the cars parked before a restart are restored from
+        the journal (and the snapshot, if snapshot_path is given) and new events
+        are appended to it; capacity and name still come from the config.
+        """
+        config = load_config(config_path, carpark)
+        if journal_path is None:
+            return cls(capacity=config.capacity, name=config.name, **kwargs)
+        return cls.restore(kwargs.pop("snapshot_path", None), EventJournal(journal_path),
+                           capacity=config.capacity, name=config.name, **kwargs)
+
+    def reconfigure(self, capacity: Optional[int] = None, name: Optional[str] = None):
+        """
+        Change capacity and/or name while running; parked cars are kept. If the
+        new capacity is below the current occupancy, entries are refused until
+        enough cars have left.
+        """
+        with self._lock:
+            if capacity is not None:
+                self.capacity = capacity
+            if name is not None:
+                self.name = name
+
+    def _record(self, event: Dict):
+        self._events_since_snapshot += 1
+        if self._pending is not None:
+            self._pending.append(event)
+            return
+        if self._subscribers:
+            self._outbox.append(event)
+        if self.keep_log:
+            self._log.append(event)
+        if self._journal is not None:
+            self._journal.append(event)
 
     def available_spaces(self) -> int:
+        # lock-free: len() of a dict is atomic, and the lock keeps it <= capacity
         return max(0, self.capacity - len(self._active_cars))
 
     def total_spaces(self) -> int:
@@ -28,36 +118,121 @@ class CarparkManagement:
     def handle_entry(self, license_plate: str, model: Optional[str] = None, when: Optional[datetime] = None) -> bool:
         """
         Return True if entry accepted, False if carpark is full or duplicate.
+        Safe to call from several sensor threads at once.
+        """
+        when = when or self.clock()
+        with self._lock:
+            accepted = self._enter(license_plate, model, when)
+            events = self._take_outbox()
+        self._after_change(events)
+        return accepted
+
+    def handle_exit(self, license_plate: str, when: Optional[datetime] = None) -> bool:
+        """
+        Return True if exit processed, False if car not found.
+        Safe to call from several sensor threads at once.
+        """
+        when = when or self.clock()
+        with self._lock:
+            accepted = self._exit(license_plate, when)
+            events = self._take_outbox()
+        self._after_change(events)
+        return accepted
+
+    def handle_entries(self, entries: Iterable[Tuple[str, Optional[str], Optional[datetime]]]) -> List[bool]:
+        """
+        Process many (plate, model, when) entries in one pass, in order.
+        Returns one accept/reject flag per entry, like handle_entry.
+        """
+        now = None
+        results = []
+        with self._lock:
+            self._pending = []
+            try:
+                for plate, model, when in entries:
+                    if when is None:
+                        when = now = now or self.clock()
+                    results.append(self._enter(plate, model, when))
+            finally:
+                self._flush_pending()
+            events = self._take_outbox()
+        self._after_change(events)
+        return results
+
+    def handle_exits(self, exits: Iterable[Tuple[str, Optional[datetime]]]) -> List[bool]:
+        """
+        Process many (plate, when) exits in one pass, in order.
+        Returns one accept/reject flag per exit, like handle_exit.
         """
-        when = when or datetime.now()
+        now = None
+        results = []
+        with self._lock:
+            self._pending = []
+            try:
+                for plate, when in exits:
+                    if when is None:
+                        when = now = now or self.clock()
+                    results.append(self._exit(plate, when))
+            finally:
+                self._flush_pending()
+            events = self._take_outbox()
+        self._after_change(events)
+        return results
+
+    def _flush_pending(self):
+        # caller holds self._lock
+        events, self._pending = self._pending, None
+        if self._subscribers:
+            self._outbox.extend(events)
+        if self.keep_log:
+            self._log.extend(events)
+        if self._journal is not None:
+            self._journal.append_many(events)
+
+    def _enter(self, license_plate: str, model: Optional[str], when: datetime) -> bool:
+        # caller holds self._lock
+        self._expire_overstays(when.timestamp())
         if license_plate in self._active_cars:
             # duplicate entry (car already inside)
-            self._log.append({"event": "entry_rejected_already_in", "plate": license_plate, "when": when.isoformat()})
+            self._record({"event": "entry_rejected_already_in", "plate": license_plate, "when": when.isoformat()})
             return False
 
         if len(self._active_cars) >= self.capacity:
             # full
-            self._log.append({"event": "entry_rejected_full", "plate": license_plate, "when": when.isoformat()})
+            self._record({"event": "entry_rejected_full", "plate": license_plate, "when": when.isoformat()})
             return False
 
-        car = Car(license_plate=license_plate, model=model)
-        car.mark_entry(when)
-        self._active_cars[license_plate] = car
-        self._log.append({"event": "entry", "plate": license_plate, "model": model, "when": when.isoformat()})
+        car = self._admit(license_plate, model, when)
+        self._record({"event": "entry", "plate": car.license_plate, "model": model, "when": when.isoformat()})
         return True
 
-    def handle_exit(self, license_plate: str, when: Optional[datetime] = None) -> bool:
-        """
-        Return True if exit processed, False if car not found.
-        """
-        when = when or datetime.now()
+    def _admit(self, license_plate: str, model: Optional[str], when: datetime) -> Car:
+        # caller holds self._lock; updates state only, no log record
+        # interned plates share one string object between the store, indexes and events
+        license_plate = sys.intern(license_plate)
+        car = Car(license_plate=license_plate, model=model, entry_time=when)
+        self._active_cars[license_plate] = car
+        stamp = when.timestamp()
+        if self.occupancy is not None:
+            self.occupancy.add(stamp, 1)
+        self.rolling.arrival(stamp)
+        bisect.insort(self._sorted_plates, license_plate)
+        self._by_model.setdefault(model, set()).add(license_plate)
+        bisect.insort(self._by_entry, (stamp, license_plate))
+        if self.overstays is not None:
+            self.overstays.add(license_plate, stamp)
+        return car
+
+    def _exit(self, license_plate: str, when: datetime) -> bool:
+        # caller holds self._lock
+        self._expire_overstays(when.timestamp())
         car = self._active_cars.pop(license_plate, None)
         if car is None:
-            self._log.append({"event": "exit_rejected_not_found", "plate": license_plate, "when": when.isoformat()})
+            self._record({"event": "exit_rejected_not_found", "plate": license_plate, "when": when.isoformat()})
             return False
 
-        car.mark_exit(when)
-        self._log.append({
+        self._release(car, when)
+        self._record({
             "event": "exit",
             "plate": license_plate,
             "model": car.model,
@@ -66,14 +241,319 @@ class CarparkManagement:
         })
         return True
 
+    def _release(self, car: Car, when: datetime):
+        # caller holds self._lock and has removed the car; updates state only
+        car.mark_exit(when)
+        stamp = when.timestamp()
+        if self.occupancy is not None:
+            self.occupancy.add(stamp, -1)
+        self.rolling.departure(stamp, car.entry_time.timestamp())
+        plate = car.license_plate
+        del self._sorted_plates[bisect.bisect_left(self._sorted_plates, plate)]
+        models = self._by_model[car.model]
+        models.discard(plate)
+        if not models:
+            del self._by_model[car.model]
+        del self._by_entry[bisect.bisect_left(self._by_entry, (car.entry_time.timestamp(), plate))]
+        if self.history is not None and car.entry_time is not None:
+            self.history.add(car.entry_time, when, car.model)
+        if self.overstays is not None:
+            self.overstays.cancel(plate)
+
+    def _expire_overstays(self, now: float) -> List[str]:
+        # caller holds self._lock; records one event per car past its deadline
+        if self.overstays is None:
+            return []
+        due = self.overstays.pop_due(now)
+        for plate, deadline in due:
+            car = self._active_cars[plate]
+            self._record({
+                "event": "overstay",
+                "plate": plate,
+                "model": car.model,
+                "entry": car.entry_time.isoformat(),
+                "when": datetime.fromtimestamp(deadline).isoformat(),
+            })
+        return [plate for plate, _ in due]
+
+    def _replay(self, event: Dict):
+        # re-apply a journaled event without recording it again
+        kind = event.get("event")
+        if kind == "entry" and event["plate"] not in self._active_cars:
+            self._admit(event["plate"], event.get("model"), datetime.fromisoformat(event["when"]))
+        elif kind == "exit":
+            car = self._active_cars.pop(event["plate"], None)
+            if car is not None:
+                self._release(car, datetime.fromisoformat(event["exit"]))
+        elif kind == "overstay" and self.overstays is not None:
+            # already reported before the restart
+            self.overstays.cancel(event["plate"])
+
+    def save_snapshot(self, path: str):
+        """
+        Write the cars currently inside plus the journal position to `path`.
+        Together with the journal this is enough for CarparkManagement.restore().
+        """
+        with self._snapshot_lock:
+            self._write_snapshot(path)
+
+    def _write_snapshot(self, path: str):
+        # caller holds self._snapshot_lock
+        with self._lock:
+            snapshot = {
+                "name": self.name,
+                "capacity": self.capacity,
+                "saved_at": datetime.now().isoformat(),
+                "journal_offset": self._journal.tell() if self._journal is not None else None,
+                "cars": [[c.license_plate, c.model, c.entry_time.isoformat() if c.entry_time else None]
+                         for c in self._active_cars.values()],
+                # cars inside that were already reported, so a restart does not report them again
+                "overstayed": [p for p in self._active_cars if p not in self.overstays]
+                              if self.overstays is not None else [],
+            }
+            self._events_since_snapshot = 0
+        # write then rename, so a crash never leaves a half-written snapshot
+        path = Path(path)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(json.dumps(snapshot, separators=(",", ":")))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        _fsync_dir(path.parent)
+
+    @classmethod
+    def restore(cls, snapshot_path: Optional[str], journal: EventJournal, **kwargs):
+        """
+        Rebuild a manager from the latest snapshot (if any) and replay only
+        the journal events written after it. New events go to the same journal
+        (opening an EventJournal cuts off a line torn by a crash), and later
+        snapshots to the same snapshot_path.
+        """
+        kwargs.setdefault("snapshot_path", snapshot_path)
+        offset = 0
+        snapshot = None
+        if snapshot_path is not None and Path(snapshot_path).exists():
+            snapshot = json.loads(Path(snapshot_path).read_text())
+            offset = snapshot.get("journal_offset") or 0
+            kwargs.setdefault("capacity", snapshot["capacity"])
+            kwargs.setdefault("name", snapshot["name"])
+        center = cls(journal=journal, **kwargs)
+
+        with center._lock:
+            if snapshot is not None:
+                for plate, model, entry in snapshot["cars"]:
+                    center._admit(plate, model, datetime.fromisoformat(entry) if entry else center.clock())
+                if center.overstays is not None:
+                    for plate in snapshot.get("overstayed", ()):
+                        center.overstays.cancel(plate)
+            for event in read_journal(journal.path, offset):
+                center._replay(event)
+        return center
+
+    def subscribe(self, callback: Callable[[Dict], None]) -> Callable[[], None]:
+        """
+        Call `callback(event)` for every event the manager records (the same
+        dicts as in the log). Callbacks run on the thread that caused the
+        change, after the manager's lock is released; an exception from a callback is
+        logged and does not affect the others. Returns an unsubscribe function.
+        """
+        with self._lock:
+            self._subscribers = self._subscribers + [callback]
+
+        def unsubscribe():
+            with self._lock:
+                self._subscribers = [c for c in self._subscribers if c is not callback]
+        return unsubscribe
+
+    def temperature_reading(self, reading: float, when: Optional[datetime] = None):
+        """Record a temperature measurement and notify subscribers."""
+        when = when or self.clock()
+        with self._lock:
+            self._record({"event": "temperature", "value": reading, "when": when.isoformat()})
+            events = self._take_outbox()
+        self._after_change(events)
+
+    def check_overstays(self, now: Optional[datetime] = None) -> List[str]:
+        """
+        Record an "overstay" event for every car that has passed the maximum
+        stay by `now` (each car is reported once) and notify subscribers.
+        Entries and exits do this too; call it from a timer (see
+        carpark_overstay.OverstayTimer) to report cars while the gates are quiet.
+        Returns the plates reported.
+        """
+        if self.overstays is None:
+            return []
+        now = now or self.clock()
+        with self._lock:
+            plates = self._expire_overstays(now.timestamp())
+            events = self._take_outbox()
+        self._after_change(events)
+        return plates
+
+    def next_overstay(self) -> Optional[datetime]:
+        """When the next car will pass the maximum stay (None if no car will)."""
+        if self.overstays is None:
+            return None
+        with self._lock:
+            deadline = self.overstays.next_deadline()
+        return datetime.fromtimestamp(deadline) if deadline is not None else None
+
+    def _take_outbox(self) -> List[Dict]:
+        # caller holds self._lock
+        if not self._outbox:
+            return []
+        events, self._outbox = self._outbox, []
+        return events
+
+    def _after_change(self, events: List[Dict]):
+        subscribers = self._subscribers
+        for event in events:
+            for callback in subscribers:
+                try:
+                    callback(event)
+                except Exception:
+                    # the change is already applied; one bad listener must not fail the gate call
+                    log.exception("Subscriber %r failed on %s event", callback, event.get("event"))
+        self._maybe_snapshot()
+
+    def _maybe_snapshot(self):
+        if not self.snapshot_every or self._events_since_snapshot < self.snapshot_every:
+            return
+        # if another thread is already writing one, its snapshot will do
+        if not self._snapshot_lock.acquire(blocking=False):
+            return
+        try:
+            self._write_snapshot(self.snapshot_path)
+        except Exception:
+            # the event itself was applied; a failed snapshot must not fail the gate call
+            log.exception("Could not write snapshot to %s", self.snapshot_path)
+        finally:
+            self._snapshot_lock.release()
+
     def get_active_cars(self):
         return list(self._active_cars.values())
 
+    def active_cars(self):
+        """
+        Live, read-only view of the cars inside (no copy).
+        Use get_active_cars() instead if other threads may change the carpark while you iterate.
+        """
+        return self._active_cars.values()
+
+    def active_plates(self):
+        """Live view of the plates inside; supports O(1) `plate in ...` checks."""
+        return self._active_cars.keys()
+
+    def occupied(self) -> int:
+        return len(self._active_cars)
+
+    def is_parked(self, license_plate: str) -> bool:
+        return license_plate in self._active_cars
+
+    def plates_with_prefix(self, prefix: str) -> List[str]:
+        """Sorted plates inside that start with `prefix`."""
+        with self._lock:
+            plates = self._sorted_plates
+            if not prefix:
+                return list(plates)
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            return plates[bisect.bisect_left(plates, prefix):bisect.bisect_left(plates, upper)]
+
+    def cars_by_model(self, model: Optional[str]) -> List[Car]:
+        with self._lock:
+            return [self._active_cars[p] for p in self._by_model.get(model, ())]
+
+    def cars_entered_between(self, start: datetime, end: datetime) -> List[Car]:
+        """Cars inside whose entry time is in [start, end], oldest first."""
+        with self._lock:
+            entries = self._by_entry
+            lo = bisect.bisect_left(entries, (start.timestamp(),))
+            hi = bisect.bisect_right(entries, (end.timestamp(), chr(0x10FFFF)))
+            return [self._active_cars[p] for _, p in entries[lo:hi]]
+
+    def occupancy_at(self, when: datetime) -> int:
+        """Number of cars that were parked at `when`."""
+        self._check_occupancy()
+        with self._lock:
+            return self.occupancy.at(when.timestamp())
+
+    def occupancy_between(self, start: datetime, end: datetime) -> Dict:
+        """Min, max and time-weighted mean occupancy between `start` and `end`."""
+        self._check_occupancy()
+        with self._lock:
+            return self.occupancy.between(start.timestamp(), end.timestamp())
+
+    def visit_stats(self, percentiles: Sequence[float] = (50, 90, 99), model: Optional[str] = None) -> Dict:
+        """
+        Dwell statistics, peak occupancy and hourly turnover of the completed
+        visits. The columns are copied under the lock, so gates are only held
+        up for the copy, not for the statistics.
+        """
+        if self.history is None:
+            raise ValueError("Visit history is disabled; create the manager with keep_history=True")
+        with self._lock:
+            history = self.history.copy()
+        return {
+            "dwell": history.dwell_stats(percentiles, model),
+            "peak_occupancy": history.peak_occupancy(),
+            "hourly_turnover": history.hourly_turnover(),
+        }
+
+    def _check_occupancy(self):
+        if self.occupancy is None:
+            raise ValueError("Occupancy timeline is disabled; create the manager with keep_occupancy=True")
+
+    def rolling_stats(self, now: Optional[datetime] = None) -> Dict:
+        """
+        Occupancy rate over the last 15 min / 1 h (0..1), arrivals and departures
+        per minute (last 15 min), mean dwell of the cars inside and seconds until
+        full at the current net inflow (None when not filling up).
+        """
+        now = (now or self.clock()).timestamp()
+        with self._lock:
+            return self.rolling.summary(now, self.capacity)
+
     def get_log(self):
         return list(self._log)
 
-    def save_log(self, path: str):
+    def save_log(self, path: Optional[str] = None):
+        """
+        Persist the event log. With a journal attached this only flushes the
+        events written since the last save; otherwise the in-memory log is dumped to `path`.
+        """
+        if self._journal is not None:
+            self._journal.flush()
+            if path is None or Path(path) == self._journal.path:
+                return
+        if not self.keep_log:
+            raise ValueError("In-memory log is disabled; events are only kept in the journal")
         Path(path).write_text(json.dumps(self._log, indent=2))
 
+    def close(self):
+        """Write a last snapshot (if snapshots are configured) and close the journal."""
+        if self.snapshot_path is not None:
+            self.save_snapshot(self.snapshot_path)
+        if self._journal is not None:
+            self._journal.close()
+
     def __repr__(self):
-        return f"<CarparkManagement name={self.name} capacity={self.capacity} occupied={len(self._active_cars)}>"
\ No newline at end of file
+        return f"<CarparkManagement name={self.name} capacity={self.capacity} occupied={self.occupied()}>"
+
+
+def _fsync_dir(path: Path):
+    # make a rename in `path` durable; not possible (nor needed) on Windows
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,163 @@
+"""
+Opt-in latency and outcome metrics, exported in the Prometheus text format.
+
+Nothing is measured unless you call one of the instrument_* helpers, which
+wrap the existing objects in place:
+
+    metrics = MetricsRegistry()
+    instrument_manager(center, metrics)
+    instrument_sensor(entry_sensor, metrics, "entry")
+    display.refresh = instrument_call(display.refresh, metrics, "display_refresh")
+    metrics.write("carpark.prom")      # or metrics.serve(9100)
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Sequence, Tuple
+
+# seconds; roughly x2.5 steps from 10 microseconds to 1 second
+DEFAULT_BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 0.1, 0.25, 1.0)
+
+# manager event -> outcome counter label
+OUTCOMES = {
+    "entry": "accepted",
+    "exit": "accepted",
+    "entry_rejected_full": "rejected_full",
+    "entry_rejected_already_in": "rejected_duplicate",
+    "exit_rejected_not_found": "not_found",
+}
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    def __init__(self, prefix: str = "carpark"):
+        self.prefix = prefix
+        self.counters: Dict[Tuple[str, Tuple], int] = {}
+        self.histograms: Dict[Tuple[str, Tuple], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, amount: int = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            seen = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                full = f"{self.prefix}_{name}_total"
+                if full not in seen:
+                    seen.add(full)
+                    lines.append(f"# TYPE {full} counter")
+                lines.append(f"{full}{_labels(labels)} {value}")
+            for (name, labels), h in sorted(self.histograms.items(), key=lambda item: item[0]):
+                full = f"{self.prefix}_{name}_seconds"
+                if full not in seen:
+                    seen.add(full)
+                    lines.append(f"# TYPE {full} histogram")
+                running = 0
+                bounds = [repr(b) for b in h.buckets] + ["+Inf"]
+                for bound, count in zip(bounds, h.counts):
+                    running += count
+                    lines.append(f"{full}_bucket{_labels(labels + (('le', bound),))} {running}")
+                lines.append(f"{full}_sum{_labels(labels)} {h.sum}")
+                lines.append(f"{full}_count{_labels(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Write a .prom file for the node_exporter textfile collector (atomically)."""
+        tmp = Path(str(path) + ".tmp")
+        tmp.write_text(self.render())
+        tmp.replace(path)
+
+    def serve(self, port: int = 9100, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve /metrics from a daemon thread. Returns the server (call .shutdown() to stop)."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="carpark-metrics", daemon=True).start()
+        return server
+
+
+def _labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+def instrument_call(func, metrics: MetricsRegistry, name: str, **labels):
+    """Wrap any callable so each call's duration is observed as `name`."""
+    perf_counter = time.perf_counter
+
+    @wraps(func)
+    def timed(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            metrics.observe(name, perf_counter() - start, **labels)
+    return timed
+
+
+def instrument_manager(manager, metrics: MetricsRegistry):
+    """
+    Time handle_entry/handle_exit (and the batch handle_entries/handle_exits,
+    per batch) and count the outcome of every event, single or batched.
+    """
+    manager.handle_entry = instrument_call(manager.handle_entry, metrics, "manager_event", kind="entry")
+    manager.handle_exit = instrument_call(manager.handle_exit, metrics, "manager_event", kind="exit")
+    manager.handle_entries = instrument_call(manager.handle_entries, metrics, "manager_batch", kind="entry")
+    manager.handle_exits = instrument_call(manager.handle_exits, metrics, "manager_batch", kind="exit")
+
+    def count(event):
+        outcome = OUTCOMES.get(event["event"])
+        if outcome is not None:
+            metrics.inc("events", outcome=outcome, kind=event["event"].split("_")[0])
+    return manager.subscribe(count)
+
+
+def instrument_sensor(sensor, metrics: MetricsRegistry, kind: str):
+    """
+    Time a sensor from detection until its callback returns, i.e. until the
+    manager's state has changed. Create the sensors after instrument_manager()
+    if their callbacks should also go through the timed manager methods.
+    """
+    sensor.callback = instrument_call(sensor.callback, metrics, "sensor_to_state", kind=kind)
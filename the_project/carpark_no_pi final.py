@@ -3,105 +3,136 @@ Fresh no_pi.py with full config auto-detection and error feedback.
 Uses your existing:
     - management.py
     - sensors.py
-    - display.py   (for read_temperature)
+    - carpark_gui_bridge.py (GUIDataProvider)
 """
 
 import tkinter as tk
 import time
 import os
+import queue
+import threading
+import bisect
 from pathlib import Path
 
 from carpark_manager import CarparkManagement
-from carpark_sensors import EntrySensor, ExitSensor
-from carpark_display import read_temperature
+from carpark_config import ConfigWatcher
+from carpark_sensors import DebounceFilter, EntrySensor, ExitSensor
+from carpark_gui_bridge import GUIDataProvider
+from carpark_logfile import LOG_TAGS, BackgroundLogWriter, log_events
+from carpark_segments import SegmentedLog
+from carpark_metrics import MetricsRegistry, instrument_call, instrument_manager
+from carpark_overstay import OverstayTimer
+
+HERE = Path(__file__).parent
+# All log lines go through one background writer (see start_gui)
+LOG_FILE = HERE / "carpark_log.txt"
 
-def write_log_to_file(message, filename="carpark_log.txt"):
-    """Append a log message to a text file, guaranteed to create it."""
-    timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-    
-    # ALWAYS save in same folder as no_pi.py
-    log_path = Path(__file__).parent / filename
-
-    with open(log_path, "a") as f:
-        f.write(f"{timestamp}  {message}\n")
-
-    print(f"[LOG SAVED] {log_path}")
 # ---------------- CONFIG AUTO-DETECTION ---------------- #
 
-def load_carpark_manager():
-    possible_files = ["moondalup_carpark\\the_project\\moondalup.json", "config.json", "settings.json"]
+def find_config(config_path=None):
+    """`config_path`, or the first config found next to this file / in the cwd."""
+    if config_path is not None:
+        possible_files = [Path(config_path)]
+    else:
+        possible_files = [HERE / "moondalup.json", Path("config.json"), Path("settings.json")]
     for f in possible_files:
-        if Path(f).exists():
+        if f.exists():
             print(f"[INFO] Using config file: {f}")
-            return CarparkManagement.from_config_file(f)
+            return f
 
     print("[ERROR] No config file found.")
+    print("Looked for:", ", ".join(str(f) for f in possible_files))
     print("Files in folder:", os.listdir("."))
     raise FileNotFoundError("No config found")
 
 
-# ---------------- DATA PROVIDER ---------------- #
-
-class GUIDataProvider:
-    def __init__(self, manager, weather_file="weather.json"):
-        self.manager = manager
-        self.temperature = read_temperature(weather_file) or 22
-
-    @property
-    def available_spaces(self):
-        return self.manager.available_spaces()
-
-    @property
-    def current_time(self):
-        return time.localtime()
-
-    def update_temperature(self, temp):
-        self.temperature = temp
+def load_carpark_manager(config_path=None, **kwargs):
+    """Manager from `config_path`, or from the first config found (see find_config)."""
+    return CarparkManagement.from_config_file(str(find_config(config_path)), **kwargs)
 
 
 # ---------------- SENSOR BRIDGE ---------------- #
 
 class GUISensorConnector:
-    def __init__(self, manager, provider, update_display, update_log, update_parked):
+    def __init__(self, manager, provider):
         self.manager = manager
         self.provider = provider          # ← STORE PROVIDER HERE
-        self.update_display = update_display
-        self.update_log = update_log
-        self.update_parked = update_parked
 
-        # Use your existing sensors.py
-        self.entry = EntrySensor(callback=manager.handle_entry)
-        self.exit = ExitSensor(callback=manager.handle_exit)
+        # Use your existing sensors.py; repeats of a plate within 2 s are dropped.
+        # What the manager accepts reaches the log window and file through its subscribers.
+        self.entry = EntrySensor(callback=manager.handle_entry, debounce=DebounceFilter(2.0))
+        self.exit = ExitSensor(callback=manager.handle_exit, debounce=DebounceFilter(2.0))
 
     def incoming_car(self, plate):
-        self.entry.detect(plate)               
-        message = f"[IN]  {plate}"
-        self.update_log(message)               
-        write_log_to_file(message)             
+        self.entry.detect(plate)
 
     def outgoing_car(self, plate):
-        self.exit.detect(plate)                
-        message = f"[OUT] {plate}"
-        self.update_log(message)               
-        write_log_to_file(message)             
-
-    def _refresh(self, log_message):
-        self.update_display()
-        self.update_log(log_message)
-        self.update_parked()
+        self.exit.detect(plate)
+
+
+# ---------------- UPDATE NOTIFIER ---------------- #
+
+class TkNotifier:
+    """
+    Receives manager events from any thread and hands them to the GUI on the
+    Tk loop. A burst of events is coalesced into one call per frame.
+
+    Tk is not thread-safe, so other threads only put events on a queue; the
+    queue is drained by a timer that runs on the Tk thread. The timer slows
+    down to `idle_ms` while nothing happens, and an event posted on the Tk
+    thread itself (the control window's buttons) is flushed in the next frame.
+    Create the notifier on the Tk thread.
+    """
+    def __init__(self, root, frame_ms=16, idle_ms=250):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.idle_ms = idle_ms
+        self.handlers = []
+        self._events = queue.SimpleQueue()
+        self._tk_thread = threading.current_thread()
+        self._delay = frame_ms
+        self._after_id = self.root.after(self._delay, self._flush)
+
+    def add_handler(self, handler):
+        """handler(events) runs on the Tk thread with the events since the last frame."""
+        self.handlers.append(handler)
+
+    def post(self, event):
+        # any thread; only the Tk thread may touch Tk
+        self._events.put(event)
+        if threading.current_thread() is self._tk_thread and self._delay > self.frame_ms:
+            self.root.after_cancel(self._after_id)
+            self._schedule(self.frame_ms)
+
+    def _schedule(self, delay):
+        self._delay = delay
+        self._after_id = self.root.after(delay, self._flush)
+
+    def _flush(self):
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                break
+        # back off while idle: 16, 32, ... up to idle_ms between checks
+        self._schedule(self.frame_ms if events else min(self._delay * 2, self.idle_ms))
+        if events:
+            for handler in self.handlers:
+                handler(events)
 
 
 # ---------------- DISPLAY WINDOW ---------------- #
 
 class CarParkDisplay:
-    fields = ['Available bays', 'Temperature', 'Time']
+    fields = ['Available bays', 'Temperature', 'Time', 'Trend']
 
     def __init__(self, root, provider: GUIDataProvider):
         self.provider = provider
 
         self.win = tk.Toplevel(root)
         self.win.title("Moondalup Carpark")
-        self.win.geometry("600x250")
+        self.win.geometry("600x300")
 
         self.labels = {}
         for i, field in enumerate(self.fields):
@@ -111,12 +142,27 @@ class CarParkDisplay:
             self.labels[field] = label
 
         self.refresh()
+        self.tick_clock()
 
-    def refresh(self):
+    def refresh(self, events=None):
+        # called by the notifier when the carpark changes
         self.labels['Available bays'].config(text=self.provider.available_spaces)
         self.labels['Temperature'].config(text=f"{self.provider.temperature:.1f}℃")
+
+    def tick_clock(self):
+        # carpark changes are event driven; the clock, weather.json and the trend follow this timer
         self.labels['Time'].config(text=time.strftime("%H:%M:%S", self.provider.current_time))
-        self.win.after(1000, self.refresh)
+        self.labels['Temperature'].config(text=f"{self.provider.temperature:.1f}℃")
+        # rates decay while nothing happens, so the trend follows the clock
+        self.labels['Trend'].config(text=self.trend_text())
+        self.win.after(1000, self.tick_clock)
+
+    def trend_text(self):
+        provider = self.provider
+        text = f"{provider.arrivals_per_minute:.1f} in / {provider.departures_per_minute:.1f} out per min"
+        if provider.fill_eta is not None:
+            text += f", full in {provider.fill_eta / 60:.0f} min"
+        return text
 
 
 # ---------------- CONTROL WINDOW ---------------- #
@@ -150,7 +196,7 @@ class ControlWindow:
         try:
             temp = float(self.temp_var.get())
             self.connector.provider.update_temperature(temp)
-            self.connector.update_display()
+            self.connector.manager.temperature_reading(temp)
         except ValueError:
             pass
 
@@ -158,7 +204,19 @@ class ControlWindow:
 # ---------------- LOG WINDOW ---------------- #
 
 class LogWindow:
-    def __init__(self, root):
+    """
+    Live log with a bounded scrollback. Lines are buffered and inserted at
+    most once per frame; once the widget holds more than max_lines + trim_chunk
+    lines the oldest are deleted in one go.
+    """
+    def __init__(self, root, max_lines=5000, trim_chunk=500, frame_ms=50):
+        self.max_lines = max_lines
+        self.trim_chunk = trim_chunk
+        self.frame_ms = frame_ms
+        self._pending = []
+        self._scheduled = False
+        self._lines = 0
+
         win = tk.Toplevel(root)
         win.title("Live Log")
         win.geometry("400x300")
@@ -167,37 +225,157 @@ class LogWindow:
         self.box.pack(fill=tk.BOTH, expand=True)
 
     def write(self, msg):
+        self._pending.append(msg)
+        if not self._scheduled:
+            self._scheduled = True
+            self.box.after(self.frame_ms, self._flush)
+
+    def _flush(self):
+        self._scheduled = False
+        lines, self._pending = self._pending, []
+        if not lines:
+            return
         self.box.config(state='normal')
-        self.box.insert(tk.END, msg + "\n")
+        self.box.insert(tk.END, "\n".join(lines) + "\n")
+        self._lines += len(lines)
+        if self._lines > self.max_lines + self.trim_chunk:
+            excess = self._lines - self.max_lines
+            self.box.delete("1.0", f"{excess + 1}.0")
+            self._lines -= excess
         self.box.config(state='disabled')
-
-        # ALSO WRITE TO FILE
-        write_log_to_file(msg)   # ← NEW
+        self.box.see(tk.END)
 
 # ---------------- ACTIVE CARS WINDOW ---------------- #
 
 class ParkedCarsWindow:
-    def __init__(self, root, manager):
+    """
+    Sorted list of parked plates. Entry/exit events insert or delete single
+    rows instead of rebuilding the list. With virtual=True only the visible
+    rows exist in the listbox, so the widget stays small at any occupancy.
+    """
+    VISIBLE_ROWS = 12
+
+    def __init__(self, root, manager, virtual=False):
         self.manager = manager
+        self.virtual = virtual
+        self._plates = []    # plates matching the filter, sorted (the model behind the rows)
+        self._top = 0        # first visible row in virtual mode
 
         win = tk.Toplevel(root)
         win.title("Currently Parked Cars")
         win.geometry("400x300")
 
-        self.listbox = tk.Listbox(win, font=('Arial', 16))
+        self.filter_var = tk.StringVar()
+        tk.Entry(win, textvariable=self.filter_var, font=('Arial', 14)).pack(fill=tk.X)
+        self.filter_var.trace_add("write", lambda *_: self.rebuild())
+        self.count_label = tk.Label(win, text="", font=('Arial', 10))
+        self.count_label.pack(fill=tk.X)
+
+        scrollbar = tk.Scrollbar(win)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox = tk.Listbox(win, font=('Arial', 16), height=self.VISIBLE_ROWS)
         self.listbox.pack(fill=tk.BOTH, expand=True)
+        if virtual:
+            self.scrollbar = scrollbar
+            scrollbar.config(command=self._scroll)
+            self.listbox.bind("<MouseWheel>", lambda e: self._scroll("scroll", -1 if e.delta > 0 else 1, "units"))
+        else:
+            self.listbox.config(yscrollcommand=scrollbar.set)
+            scrollbar.config(command=self.listbox.yview)
+
+        self.rebuild()
 
-    def refresh(self):
+    @property
+    def prefix(self):
+        return self.filter_var.get().strip()
+
+    def rebuild(self):
+        """Full reload, used at start-up and when the filter changes."""
+        self._plates = self.manager.plates_with_prefix(self.prefix)
+        self._top = 0
+        if self.virtual:
+            self._render_window()
+        else:
+            self.listbox.delete(0, tk.END)
+            self.listbox.insert(tk.END, *self._plates)
+        self._update_count()
+
+    def refresh(self, events=None):
+        """Apply entry/exit events as row inserts/deletes (notifier handler)."""
+        if events is None:
+            self.rebuild()
+            return
+        prefix = self.prefix
+        changed = False
+        for event in events:
+            kind = event["event"]
+            if kind not in ("entry", "exit") or not event["plate"].startswith(prefix):
+                continue
+            plate = event["plate"]
+            i = bisect.bisect_left(self._plates, plate)
+            # a rebuild() between the event and this flush has already applied it
+            present = self._plates[i:i + 1] == [plate]
+            if kind == "entry" and not present:
+                self._plates.insert(i, plate)
+                if not self.virtual:
+                    self.listbox.insert(i, plate)
+            elif kind == "exit" and present:
+                del self._plates[i]
+                if not self.virtual:
+                    self.listbox.delete(i)
+            else:
+                continue
+            changed = True
+        if changed:
+            if self.virtual:
+                self._render_window()
+            self._update_count()
+
+    def _update_count(self):
+        self.count_label.config(text=f"{len(self._plates)} cars")
+
+    def _render_window(self):
+        total = len(self._plates)
+        self._top = max(0, min(self._top, total - self.VISIBLE_ROWS))
+        rows = self._plates[self._top:self._top + self.VISIBLE_ROWS]
         self.listbox.delete(0, tk.END)
-        for car in self.manager.get_active_cars():
-            self.listbox.insert(tk.END, car.license_plate)
+        self.listbox.insert(tk.END, *rows)
+        if total:
+            self.scrollbar.set(self._top / total, (self._top + len(rows)) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self._top = int(float(amount) * len(self._plates))
+        elif unit == "pages":
+            self._top += int(amount) * self.VISIBLE_ROWS
+        else:
+            self._top += int(amount)
+        self._render_window()
 
 
 # ---------------- APP START ---------------- #
 
-def start_gui():
-    manager = load_carpark_manager()
-    provider = GUIDataProvider(manager)
+def start_gui(config_path=None, weather_file=HERE / "weather.json", log_file=LOG_FILE,
+              max_stay=None, metrics_port=None, log_segments_dir=None,
+              journal_path=None, snapshot_path=None, snapshot_every=0, watch_config=False):
+    """
+    config_path: carpark config (default: auto-detect, see load_carpark_manager)
+    max_stay: seconds; longer stays are shown in the log window
+    log_segments_dir: write rotating log segments there instead of `log_file`
+    journal_path, snapshot_path, snapshot_every: keep events in a journal and
+        restore the parked cars from it on start-up (see CarparkManagement.restore)
+    watch_config: apply capacity/name edits of the config file while running
+    """
+    config_path = find_config(config_path)
+    manager = CarparkManagement.from_config_file(str(config_path), max_stay=max_stay, journal_path=journal_path,
+                                                 snapshot_path=snapshot_path, snapshot_every=snapshot_every)
+    metrics = None
+    if metrics_port is not None:
+        metrics = MetricsRegistry()
+        instrument_manager(manager, metrics)
+    provider = GUIDataProvider(manager, weather_file)
 
     root = tk.Tk()
     root.withdraw()
@@ -205,18 +383,61 @@ def start_gui():
     display = CarParkDisplay(root, provider)
     log_win = LogWindow(root)
     parked_win = ParkedCarsWindow(root, manager)
-
-    connector = GUISensorConnector(
-        manager,
-        provider,             
-        update_display=display.refresh,
-        update_log=log_win.write,
-        update_parked=parked_win.refresh
-    )
+    if log_segments_dir is not None:
+        # rotating, compressed segments with a time index instead of one growing file
+        log_writer = BackgroundLogWriter(segments=SegmentedLog(log_segments_dir))
+    else:
+        log_writer = BackgroundLogWriter(log_file)
+
+    if metrics is not None:
+        display.refresh = instrument_call(display.refresh, metrics, "display_refresh", window="display")
+        parked_win.refresh = instrument_call(parked_win.refresh, metrics, "display_refresh", window="parked")
+        metrics.serve(metrics_port)
+
+    # manager events -> one coalesced GUI update per frame
+    notifier = TkNotifier(root)
+    notifier.add_handler(display.refresh)
+    notifier.add_handler(parked_win.refresh)
+
+    def show_events(events):
+        for event in events:
+            tag = LOG_TAGS.get(event["event"])
+            if tag is not None:
+                log_win.write(f"{tag} {event['plate']}")
+            elif event["event"] == "overstay":
+                log_win.write(f"[OVERSTAY] {event['plate']}")
+    notifier.add_handler(show_events)
+    manager.subscribe(notifier.post)
+    # the text log gets the same accepted entries/exits as in headless mode
+    log_events(manager, log_writer)
+    overstay_timer = OverstayTimer(manager).start() if max_stay else None
+
+    connector = GUISensorConnector(manager, provider)
 
     control = ControlWindow(root, connector)
 
-    root.mainloop()
+    if watch_config:
+        # polled from the Tk loop, so the display is refreshed on the Tk thread
+        watcher = ConfigWatcher(str(config_path), manager)
+        shown_error = [None]
+
+        def check_config():
+            if watcher.check():
+                display.refresh()
+                log_win.write(f"[CONFIG] {manager.name}: {manager.total_spaces()} bays")
+            elif watcher.last_error is not None and watcher.last_error is not shown_error[0]:
+                log_win.write(f"[CONFIG] {watcher.last_error}")
+            shown_error[0] = watcher.last_error
+            root.after(int(watcher.interval * 1000), check_config)
+        root.after(int(watcher.interval * 1000), check_config)
+
+    try:
+        root.mainloop()
+    finally:
+        if overstay_timer is not None:
+            overstay_timer.stop()
+        log_writer.close()
+        manager.close()
 
 
 if __name__ == "__main__":
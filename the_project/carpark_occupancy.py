@@ -0,0 +1,97 @@
+"""
+Time-indexed occupancy: how many cars were parked at a given moment.
+
+Every accepted entry/exit adds a step to a sorted timeline. Alongside the
+occupancy after each step we keep a running integral (car-seconds), so a
+point query is a binary search and the mean over any range is two lookups.
+"""
+
+import json
+from array import array
+from bisect import bisect_right
+from datetime import datetime
+from typing import Dict, Iterable
+
+from carpark_journal import read_journal
+
+
+class OccupancyIndex:
+    def __init__(self):
+        self.times = array("d")      # epoch seconds, sorted
+        self.counts = array("i")     # occupancy right after times[i]
+        self.integral = array("d")   # car-seconds from times[0] up to times[i]
+
+    def __len__(self):
+        return len(self.times)
+
+    def add(self, when: float, delta: int):
+        """Record an occupancy change of `delta` (+1 entry, -1 exit) at epoch `when`."""
+        times = self.times
+        if not times or when >= times[-1]:
+            if times:
+                self.integral.append(self.integral[-1] + self.counts[-1] * (when - times[-1]))
+                self.counts.append(self.counts[-1] + delta)
+            else:
+                self.integral.append(0.0)
+                self.counts.append(delta)
+            times.append(when)
+            return
+
+        # out-of-order event (e.g. a late replay): insert and fix up the tail
+        i = bisect_right(times, when)
+        times.insert(i, when)
+        self.counts.insert(i, self.counts[i - 1] if i else 0)
+        self.integral.insert(i, 0.0)
+        for j in range(i, len(times)):
+            self.counts[j] += delta
+        for j in range(max(i, 1), len(times)):
+            self.integral[j] = self.integral[j - 1] + self.counts[j - 1] * (times[j] - times[j - 1])
+
+    def at(self, when: float) -> int:
+        """Occupancy at epoch `when` (events at exactly `when` are included)."""
+        i = bisect_right(self.times, when) - 1
+        return self.counts[i] if i >= 0 else 0
+
+    def _integral_at(self, when: float) -> float:
+        i = bisect_right(self.times, when) - 1
+        if i < 0:
+            return 0.0
+        return self.integral[i] + self.counts[i] * (when - self.times[i])
+
+    def between(self, start: float, end: float) -> Dict:
+        """Min, max and time-weighted mean occupancy over [start, end]."""
+        if end < start:
+            raise ValueError("end must not be before start")
+        first = self.at(start)
+        lo = bisect_right(self.times, start)
+        hi = bisect_right(self.times, end)
+        inside = self.counts[lo:hi]
+        low = min(first, min(inside)) if inside else first
+        high = max(first, max(inside)) if inside else first
+        if end == start:
+            mean = float(first)
+        else:
+            mean = (self._integral_at(end) - self._integral_at(start)) / (end - start)
+        return {"min": low, "max": high, "mean": mean}
+
+    @classmethod
+    def from_events(cls, events: Iterable[Dict]) -> "OccupancyIndex":
+        """Rebuild from event records as written to the log / journal."""
+        index = cls()
+        for event in events:
+            kind = event.get("event")
+            if kind == "entry":
+                index.add(datetime.fromisoformat(event["when"]).timestamp(), 1)
+            elif kind == "exit":
+                index.add(datetime.fromisoformat(event["exit"]).timestamp(), -1)
+        return index
+
+    @classmethod
+    def from_journal(cls, path: str) -> "OccupancyIndex":
+        return cls.from_events(read_journal(path))
+
+    @classmethod
+    def from_log_file(cls, path: str) -> "OccupancyIndex":
+        """Rebuild from a JSON log written by CarparkManagement.save_log."""
+        with open(path, encoding="utf-8") as f:
+            return cls.from_events(json.load(f))
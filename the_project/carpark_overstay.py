@@ -0,0 +1,98 @@
+"""
+Overstay detection: which cars have been parked longer than allowed.
+
+OverstayTracker keeps a min-heap of (deadline, plate). Finding the cars
+that are due only pops the heap, so the cost follows the number of expiring
+cars rather than occupancy. A car that leaves is cancelled by forgetting its
+deadline; the stale heap entry is skipped when it surfaces (and the heap is
+compacted if stale entries pile up).
+
+OverstayTimer is a small thread that calls manager.check_overstays() as
+each deadline comes due.
+"""
+
+import heapq
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class OverstayTracker:
+    def __init__(self, max_stay: float):
+        """max_stay: seconds a car may stay before it is reported"""
+        self.max_stay = max_stay
+        self._heap: List[Tuple[float, str]] = []
+        self._deadlines: Dict[str, float] = {}  # plate -> live deadline
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    def __contains__(self, plate: str) -> bool:
+        """True while the car's deadline is still pending (not yet reported or cancelled)."""
+        return plate in self._deadlines
+
+    def add(self, plate: str, entered: float) -> float:
+        """Start the clock for a car that entered at epoch `entered`; returns its deadline."""
+        deadline = entered + self.max_stay
+        self._deadlines[plate] = deadline
+        heapq.heappush(self._heap, (deadline, plate))
+        return deadline
+
+    def cancel(self, plate: str):
+        """The car left (or was reported): forget it. O(1), the heap entry goes stale."""
+        self._deadlines.pop(plate, None)
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._deadlines):
+            self._heap = [(d, p) for p, d in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+    def _is_live(self, entry: Tuple[float, str]) -> bool:
+        return self._deadlines.get(entry[1]) == entry[0]
+
+    def next_deadline(self) -> Optional[float]:
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now: float) -> List[Tuple[str, float]]:
+        """(plate, deadline) for every car whose deadline is <= now, earliest first."""
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if self._is_live(entry):
+                del self._deadlines[entry[1]]
+                due.append((entry[1], entry[0]))
+        return due
+
+
+class OverstayTimer:
+    """
+    Fires manager.check_overstays() when the next deadline passes. Sleeps
+    until that deadline, but at most `max_wait` seconds so cars that arrive
+    while it sleeps are picked up.
+    """
+    def __init__(self, manager, max_wait: float = 1.0):
+        self.manager = manager
+        self.max_wait = max_wait
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="carpark-overstay-timer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        delay = 0.0
+        while not self._stop.wait(delay):
+            self.manager.check_overstays()
+            deadline = self.manager.next_overstay()
+            delay = self.max_wait
+            if deadline is not None:
+                delay = min(self.max_wait, max(0.0, deadline.timestamp() - time.time()))
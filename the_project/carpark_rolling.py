@@ -0,0 +1,123 @@
+"""
+Rolling carpark statistics, updated in O(1) per entry/exit.
+
+Time is cut into fixed buckets (one minute by default) kept in a ring that
+covers the longest window (one hour). Each bucket holds its arrivals,
+departures and car-seconds of occupancy, so a window query adds up at most
+one hour's worth of buckets and never looks at the log. Mean dwell of the
+cars inside comes from a running sum of their entry times.
+
+Only arrival() and departure() change state; the queries are read-only.
+"""
+
+from typing import Dict, Optional
+
+
+class RollingStats:
+    def __init__(self, bucket_seconds: float = 60.0, buckets: int = 60):
+        """bucket_seconds * buckets is the longest window that can be queried"""
+        self.bucket_seconds = bucket_seconds
+        self.size = buckets
+        self._arrivals = [0] * buckets
+        self._departures = [0] * buckets
+        self._area = [0.0] * buckets   # car-seconds inside each bucket
+        self._head: Optional[int] = None  # number of the newest bucket
+        self._start: Optional[float] = None
+        self._last = 0.0               # time the area was integrated up to
+        self.inside = 0
+        self._entry_sum = 0.0          # sum of entry epochs of the cars inside
+
+    def _advance(self, now: float):
+        bucket = int(now // self.bucket_seconds)
+        if self._head is None:
+            self._head, self._start, self._last = bucket, now, now
+            return
+        if now <= self._last:
+            # late event: count it in the newest bucket, time does not go back
+            return
+        if bucket - self._head >= self.size:
+            # idle for longer than the ring: every kept bucket saw the same cars
+            full = self.inside * self.bucket_seconds
+            for i in range(self.size):
+                self._arrivals[i] = self._departures[i] = 0
+                self._area[i] = full
+            self._head = bucket
+            self._area[bucket % self.size] = 0.0
+            self._last = bucket * self.bucket_seconds
+        while self._head < bucket:
+            boundary = (self._head + 1) * self.bucket_seconds
+            self._area[self._head % self.size] += self.inside * (boundary - self._last)
+            self._last = boundary
+            self._head += 1
+            slot = self._head % self.size
+            self._arrivals[slot] = self._departures[slot] = 0
+            self._area[slot] = 0.0
+        self._area[self._head % self.size] += self.inside * (now - self._last)
+        self._last = now
+
+    def arrival(self, when: float):
+        self._advance(when)
+        self._arrivals[self._head % self.size] += 1
+        self.inside += 1
+        self._entry_sum += when
+
+    def departure(self, when: float, entered: float):
+        self._advance(when)
+        self._departures[self._head % self.size] += 1
+        self.inside -= 1
+        self._entry_sum -= entered
+
+    def _window(self, now: float, seconds: float):
+        # (arrivals, departures, car-seconds, covered seconds) over the last `seconds`
+        if self._head is None:
+            return 0, 0, 0.0, 0.0
+        now = max(now, self._last)
+        count = min(self.size, max(1, int(-(-seconds // self.bucket_seconds))))
+        oldest = int(now // self.bucket_seconds) - count + 1
+        arrivals = departures = 0
+        area = 0.0
+        for bucket in range(max(oldest, self._head - self.size + 1), self._head + 1):
+            slot = bucket % self.size
+            arrivals += self._arrivals[slot]
+            departures += self._departures[slot]
+            area += self._area[slot]
+        # the cars inside since the last event, not yet added to any bucket
+        window_start = oldest * self.bucket_seconds
+        area += self.inside * (now - max(self._last, window_start))
+        covered = now - max(window_start, self._start)
+        return arrivals, departures, area, covered
+
+    def occupancy_rate(self, now: float, seconds: float, capacity: int) -> Optional[float]:
+        """Time-weighted share of spaces in use over the last `seconds` (0..1)."""
+        _, _, area, covered = self._window(now, seconds)
+        if covered <= 0 or capacity <= 0:
+            return None
+        return area / (covered * capacity)
+
+    def rates(self, now: float, seconds: float):
+        """(arrivals, departures) per minute over the last `seconds`."""
+        arrivals, departures, _, covered = self._window(now, seconds)
+        if covered <= 0:
+            return 0.0, 0.0
+        minutes = covered / 60.0
+        return arrivals / minutes, departures / minutes
+
+    def mean_dwell(self, now: float) -> Optional[float]:
+        """Average seconds the cars currently inside have been parked."""
+        if not self.inside:
+            return None
+        return now - self._entry_sum / self.inside
+
+    def summary(self, now: float, capacity: int, rate_window: float = 15 * 60) -> Dict:
+        arrivals, departures = self.rates(now, rate_window)
+        net = arrivals - departures
+        free = max(0, capacity - self.inside)
+        return {
+            "occupancy_rate_15m": self.occupancy_rate(now, 15 * 60, capacity),
+            "occupancy_rate_1h": self.occupancy_rate(now, 60 * 60, capacity),
+            "arrivals_per_minute": arrivals,
+            "departures_per_minute": departures,
+            "mean_dwell_inside": self.mean_dwell(now),
+            # seconds until full at the current net inflow; None if not filling up
+            "fill_eta": free / net * 60.0 if net > 0 else None,
+        }
@@ -0,0 +1,143 @@
+"""
+Rotating, compressed and time-indexed log segments.
+
+A SegmentedLog writes lines into segment files that roll over by size and/or
+by day. Lines are grouped into blocks; a small sidecar .idx file records each
+block's first/last timestamp and byte range. When a segment is closed each
+block is gzip-compressed on its own (the .gz file is a sequence of gzip
+members), so a time-range query can seek straight to the right blocks and
+decompress only those:
+
+    for line in read_between("logs", "carpark_log", start, end):
+        ...
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+INDEX_SUFFIX = ".idx"
+
+
+def text_log_time(line: str) -> float:
+    """Timestamp of a carpark_log.txt line ('2025-11-26 09:49:20  [IN]  ABC123')."""
+    return datetime.strptime(line[:19], "%Y-%m-%d %H:%M:%S").timestamp()
+
+
+class SegmentedLog:
+    def __init__(self, directory, prefix: str = "carpark_log", max_bytes: Optional[int] = 16 * 2**20,
+                 rotate_daily: bool = True, compress: bool = True, block_lines: int = 512):
+        """
+        max_bytes: start a new segment once the current one is this big (None = no size limit)
+        rotate_daily: start a new segment when the local date of the lines changes
+        compress: gzip closed segments block by block
+        block_lines: lines per indexed block (smaller = finer seeks, bigger index)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.compress = compress
+        self.block_lines = block_lines
+        self._file = None
+        self._path: Optional[Path] = None
+        self._day = None
+        self._size = 0
+        self._blocks: List[list] = []  # [first_ts, last_ts, offset, length]
+        self._block_count = 0
+
+    def write(self, line: str, when: float):
+        """Append one line (including its newline) that happened at epoch `when`."""
+        day = datetime.fromtimestamp(when).strftime("%Y%m%d")
+        if (self._file is None
+                or (self.rotate_daily and day != self._day)
+                or (self.max_bytes is not None and self._size >= self.max_bytes)):
+            self._rotate(day)
+
+        if not self._blocks or self._block_count >= self.block_lines:
+            self._blocks.append([when, when, self._size, 0])
+            self._block_count = 0
+        block = self._blocks[-1]
+        data = line.encode("utf-8")
+        self._file.write(data)
+        self._size += len(data)
+        block[0] = min(block[0], when)
+        block[1] = max(block[1], when)
+        block[3] += len(data)
+        self._block_count += 1
+
+    def flush(self):
+        """Flush the open segment and its index so queries can see it."""
+        if self._file is not None:
+            self._file.flush()
+            self._write_index(self._path, compressed=False)
+
+    def close(self):
+        self._close_segment()
+
+    def _index_path(self, path: Path) -> Path:
+        return path.with_name(path.name.split(".")[0] + INDEX_SUFFIX)
+
+    def _write_index(self, data_path: Path, compressed: bool):
+        index = {"file": data_path.name, "compressed": compressed, "blocks": self._blocks}
+        tmp = self._index_path(data_path).with_suffix(".tmp")
+        tmp.write_text(json.dumps(index, separators=(",", ":")))
+        tmp.replace(self._index_path(data_path))
+
+    def _rotate(self, day: str):
+        self._close_segment()
+        seq = 0
+        for existing in self.directory.glob(f"{self.prefix}-{day}-*{INDEX_SUFFIX}"):
+            seq = max(seq, int(existing.stem.rsplit("-", 1)[1]) + 1)
+        self._path = self.directory / f"{self.prefix}-{day}-{seq:03d}.log"
+        self._file = open(self._path, "ab")
+        self._day = day
+        self._size = 0
+        self._blocks = []
+        self._block_count = 0
+        self._write_index(self._path, compressed=False)
+
+    def _close_segment(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        if not self.compress:
+            self._write_index(self._path, compressed=False)
+            return
+
+        gz_path = self._path.with_name(self._path.name + ".gz")
+        with open(self._path, "rb") as plain, open(gz_path, "wb") as out:
+            offset = 0
+            for block in self._blocks:
+                plain.seek(block[2])
+                member = gzip.compress(plain.read(block[3]))
+                out.write(member)
+                block[2], block[3] = offset, len(member)
+                offset += len(member)
+        self._write_index(gz_path, compressed=True)
+        os.remove(self._path)
+
+
+def read_between(directory, prefix: str, start: float, end: float,
+                 parse_time: Callable[[str], float] = text_log_time) -> Iterator[str]:
+    """Lines with start <= time <= end, reading only the blocks that overlap the range."""
+    directory = Path(directory)
+    for index_path in sorted(directory.glob(f"{prefix}-*{INDEX_SUFFIX}")):
+        index = json.loads(index_path.read_text())
+        blocks = [b for b in index["blocks"] if b[1] >= start and b[0] <= end]
+        if not blocks:
+            continue
+        with open(directory / index["file"], "rb") as f:
+            for _, _, offset, length in blocks:
+                f.seek(offset)
+                data = f.read(length)
+                if index["compressed"]:
+                    data = gzip.decompress(data)
+                for line in data.decode("utf-8").splitlines():
+                    if start <= parse_time(line) <= end:
+                        yield line
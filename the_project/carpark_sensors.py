@@ -4,28 +4,95 @@ In production these would be replaced with code that listens to hardware events
 (e.g., networked sensors, MQTT messages, GPIO interrupts, etc.).
 """
 
-from typing import Callable
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+
+class DebounceFilter:
+    """
+    Drops repeat detections of the same plate within `window` seconds
+    (double-firing cameras, doubled log lines).
+
+    Plates are kept in two hash buckets, each covering `window` seconds.
+    When time moves past the newer bucket the older one is thrown away
+    whole, so expiry costs nothing per plate and memory stays bounded by
+    the plates seen in the last two windows.
+    """
+    def __init__(self, window: float = 2.0, clock: Callable[[], float] = time.monotonic):
+        """clock: time source for live detections; recorded ones use their own timestamp"""
+        self.window = window
+        self.clock = clock
+        self._current: Dict[str, float] = {}
+        self._previous: Dict[str, float] = {}
+        self._bucket = None
+        self.dropped = 0
+
+    def is_duplicate(self, key: str, now: Optional[float] = None) -> bool:
+        """True if `key` was seen less than `window` seconds ago; otherwise remember it."""
+        now = self.clock() if now is None else now
+        bucket = int(now // self.window)
+        if bucket != self._bucket:
+            if self._bucket is not None and bucket == self._bucket + 1:
+                self._previous = self._current
+            else:
+                self._previous = {}
+            self._current = {}
+            self._bucket = bucket
+
+        last = self._current.get(key)
+        if last is None:
+            last = self._previous.get(key)
+        if last is not None and 0 <= now - last < self.window:
+            self.dropped += 1
+            return True
+        self._current[key] = now
+        return False
+
+
+def _stamp(when: Optional[datetime]) -> Optional[float]:
+    return when.timestamp() if when is not None else None
+
 
 class EntrySensor:
-    def __init__(self, callback: Callable[[str, str], None]):
+    def __init__(self, callback: Callable[[str, str], None], debounce: Optional[DebounceFilter] = None):
         """
-        callback: function(license_plate: str, model: str)
+        callback: function(license_plate: str, model: str[, when: datetime])
+        debounce: drop repeat detections of a plate before they reach the callback
         """
         self.callback = callback
+        self.debounce = debounce
 
-    def detect(self, license_plate: str, model: str = None):
-        """Simulate detection of a car entering."""
+    def detect(self, license_plate: str, model: str = None, when: datetime = None):
+        """
+        Simulate detection of a car entering. Returns whatever the callback
+        returns, or None if the detection was dropped as a repeat.
+        """
+        if self.debounce is not None and self.debounce.is_duplicate(license_plate, _stamp(when)):
+            return None
         # In production, detection event handler calls callback with actual data.
-        self.callback(license_plate, model)
+        # `when` is only passed on for recorded events (e.g. replays).
+        if when is None:
+            return self.callback(license_plate, model)
+        return self.callback(license_plate, model, when)
 
 
 class ExitSensor:
-    def __init__(self, callback: Callable[[str], None]):
+    def __init__(self, callback: Callable[[str], None], debounce: Optional[DebounceFilter] = None):
         """
-        callback: function(license_plate: str)
+        callback: function(license_plate: str[, when: datetime])
+        debounce: drop repeat detections of a plate before they reach the callback
         """
         self.callback = callback
+        self.debounce = debounce
 
-    def detect(self, license_plate: str):
-        """Simulate detection of a car exiting."""
-        self.callback(license_plate)
+    def detect(self, license_plate: str, when: datetime = None):
+        """
+        Simulate detection of a car exiting. Returns whatever the callback
+        returns, or None if the detection was dropped as a repeat.
+        """
+        if self.debounce is not None and self.debounce.is_duplicate(license_plate, _stamp(when)):
+            return None
+        if when is None:
+            return self.callback(license_plate)
+        return self.callback(license_plate, when)